@@ -1,12 +1,23 @@
+import os
 import pandas as pd
 import torch
 from transformers import ElectraTokenizer, ElectraForSequenceClassification
 from tqdm import tqdm
 
-MODEL_DIR = "../model/koelectra_binary_sentiment"
+from shared_model import SharedModelPool, split_chunks
+
+# 12_distill_student.py 로 만든 student를 쓰려면 SENTIMENT_MODEL_DIR 지정
+# 다른 폴더에서 import 해도(17, 19) 같은 모델을 찾도록 이 파일 기준 경로
+MODEL_DIR = os.environ.get(
+    "SENTIMENT_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "model", "koelectra_binary_sentiment"),
+)
 INPUT_PATH = "../data/naver_board_kospi100_cleaned_final.csv"
 OUTPUT_PATH = "../data/naver_board_kospi100_with_sentiment.csv"
 
+# 스코어링 워커 수: 2 이상이면 가중치를 한 번만 로드해 공유 메모리로 워커들에 공유(fork)
+NUM_WORKERS = int(os.environ.get("SCORING_WORKERS", "1"))
+
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 print("사용 장치:", device)
 
@@ -46,10 +57,15 @@ def main():
     df = pd.read_csv(INPUT_PATH, encoding="utf-8")
     texts = df["제목_전처리"].astype(str).tolist()
 
-    tokenizer, model = load_model()
-
     print("전체 데이터 감성 분석 중...")
-    df["sentiment_binary"] = predict(texts, tokenizer, model)
+    if NUM_WORKERS > 1:
+        with SharedModelPool(load_model, lambda m, chunk: predict(chunk, *m), NUM_WORKERS) as pool:
+            parts = pool.map(split_chunks(texts, NUM_WORKERS * 4))
+            pool.print_report()
+        df["sentiment_binary"] = [label for part in parts for label in part]
+    else:
+        tokenizer, model = load_model()
+        df["sentiment_binary"] = predict(texts, tokenizer, model)
 
     print("\n저장합니다 →", OUTPUT_PATH)
     df.to_csv(OUTPUT_PATH, index=False, encoding="utf-8-sig")
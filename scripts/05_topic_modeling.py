@@ -1,8 +1,13 @@
 import os
+import time
+import numpy as np
 import pandas as pd
-from bertopic import BERTopic
 from sentence_transformers import SentenceTransformer
 
+import results_store
+from shared_model import embedding_encoder
+from topic_backends import make_topic_model, resolve_backend
+
 # =======================================
 # 경로 설정 (절대 경로 기반)
 # =======================================
@@ -14,6 +19,20 @@ print("📁 토픽 저장 폴더:", OUTPUT_DIR)
 
 INPUT_PATH = os.path.join(BASE_DIR, "..", "data", "naver_board_kospi100_with_sentiment.csv")
 
+# 차원축소/군집 백엔드: "auto" | "umap_hdbscan" | "ipca_kmeans" | "rp_kmeans"
+# auto → 문서 수가 많은 종목만 IncrementalPCA + MiniBatchKMeans (topic_backends.py)
+TOPIC_BACKEND = "auto"
+
+# 종목별 임베딩 보관(float16) → 15_build_embedding_index.py 에서 재사용
+EMBED_DIR = os.path.join(BASE_DIR, "..", "results", "embeddings")
+SAVE_EMBEDDINGS = True
+
+# 임베딩 워커 수: 2 이상이면 MiniLM 가중치를 한 번만 로드해 워커들이 공유(fork)
+EMBED_WORKERS = int(os.environ.get("EMBED_WORKERS", "1"))
+
+# 저장 형식: "csv"(종목별 CSV) | "sqlite"(results/results.sqlite 한 파일) | "both"
+OUTPUT_FORMAT = "csv"
+
 # =======================================
 # 토픽 모델링 시작
 # =======================================
@@ -22,7 +41,10 @@ def main():
     df = pd.read_csv(INPUT_PATH, encoding="utf-8")
     print("총 종목 수:", df["종목명"].nunique())
 
-    model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    encode, pool = embedding_encoder(
+        lambda: SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"),
+        EMBED_WORKERS,
+    )
 
     for ticker in df["종목명"].unique():
 
@@ -34,22 +56,36 @@ def main():
             continue
 
         docs = sub["제목_전처리"].tolist()
-        embeddings = model.encode(docs, show_progress_bar=False)
+        embeddings = encode(docs)
+        if SAVE_EMBEDDINGS:
+            os.makedirs(EMBED_DIR, exist_ok=True)
+            np.save(os.path.join(EMBED_DIR, f"{ticker}.npy"), embeddings.astype(np.float16))
 
-        topic_model = BERTopic(language="multilingual")
+        start = time.perf_counter()
+        topic_model = make_topic_model(len(docs), TOPIC_BACKEND)
         topics, probs = topic_model.fit_transform(docs, embeddings)
+        print(f" - 백엔드 {resolve_backend(TOPIC_BACKEND, len(docs))}: {time.perf_counter() - start:.1f}s")
 
         topic_info = topic_model.get_topic_info()
         documents = topic_model.get_document_info(docs)
 
-        # 저장 경로
-        save_path_topics = os.path.join(OUTPUT_DIR, f"{ticker}_topics.csv")
-        save_path_docs = os.path.join(OUTPUT_DIR, f"{ticker}_docs.csv")
+        if OUTPUT_FORMAT in ("csv", "both"):
+            # 저장 경로
+            save_path_topics = os.path.join(OUTPUT_DIR, f"{ticker}_topics.csv")
+            save_path_docs = os.path.join(OUTPUT_DIR, f"{ticker}_docs.csv")
+
+            topic_info.to_csv(save_path_topics, index=False, encoding="utf-8-sig")
+            documents.to_csv(save_path_docs, index=False, encoding="utf-8-sig")
+
+            print(f" ✔ 저장 완료 → {save_path_topics}")
 
-        topic_info.to_csv(save_path_topics, index=False, encoding="utf-8-sig")
-        documents.to_csv(save_path_docs, index=False, encoding="utf-8-sig")
+        if OUTPUT_FORMAT in ("sqlite", "both"):
+            results_store.save_topic_model(ticker, topic_info, documents)
+            print(f" ✔ 저장 완료 → {results_store.DB_PATH}")
 
-        print(f" ✔ 저장 완료 → {save_path_topics}")
+    if pool is not None:
+        pool.print_report()
+        pool.close()
 
     print("\n🎉 모든 종목 토픽 모델링 완료!")
 
@@ -1,6 +1,9 @@
 import pandas as pd
 import os
 
+import results_store
+from sentiment_ci import group_sentiment_ci
+
 # ==========================
 # 설정
 # ==========================
@@ -8,6 +11,13 @@ INPUT_PATH = "../data/naver_board_kospi100_with_sentiment.csv"
 OUTPUT_DIR = "../results"
 OUTPUT_PATH = os.path.join(OUTPUT_DIR, "sentiment_by_ticker.csv")
 
+# 저장 형식: "csv" | "sqlite"(results/results.sqlite 의 ticker_summary 테이블) | "both"
+OUTPUT_FORMAT = "csv"
+
+# 감성스코어 신뢰구간: "bayes"(Jeffreys 구간, 소표본에서도 폭 0 구간 없음) | "bootstrap" | None(생략)
+CI_METHOD = "bayes"
+N_BOOT = 2000
+
 # 결과 폴더 생성
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
@@ -56,12 +66,30 @@ def main():
         })
 
     result_df = pd.DataFrame(results)
+
+    # ==========================
+    # 신뢰구간 (전 종목 한 번에 리샘플링)
+    # ==========================
+    if CI_METHOD:
+        codes, stocks = pd.factorize(df["종목명"])
+        ci = group_sentiment_ci(df[sentiment_col].values, codes, n_boot=N_BOOT, method=CI_METHOD)
+        ci.index = stocks
+        ci = ci.reindex(result_df["종목명"]).reset_index(drop=True)
+        result_df["긍정비율_CI하한(%)"] = (ci["pos_ratio_ci_low"] * 100).round(2)
+        result_df["긍정비율_CI상한(%)"] = (ci["pos_ratio_ci_high"] * 100).round(2)
+        result_df["감성스코어_CI하한"] = (ci["mean_sent_ci_low"] * 100).round(2)
+        result_df["감성스코어_CI상한"] = (ci["mean_sent_ci_high"] * 100).round(2)
+
     result_df = result_df.sort_values(by="감성스코어", ascending=False)
 
     # 저장
-    result_df.to_csv(OUTPUT_PATH, index=False, encoding="utf-8-sig")
+    if OUTPUT_FORMAT in ("csv", "both"):
+        result_df.to_csv(OUTPUT_PATH, index=False, encoding="utf-8-sig")
+        print("\n📁 파일 저장 완료 →", OUTPUT_PATH)
 
-    print("\n📁 파일 저장 완료 →", OUTPUT_PATH)
+    if OUTPUT_FORMAT in ("sqlite", "both"):
+        results_store.write_table("ticker_summary", result_df)
+        print("\n📁 DB 저장 완료 →", results_store.DB_PATH)
 
     # ==========================
     # 상위 / 하위 종목 출력
@@ -1,12 +1,19 @@
+import gc
 import os
 import re
+import time
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from bertopic import BERTopic
 from sentence_transformers import SentenceTransformer
 
+import memory_stats
+import results_store
+from shared_model import embedding_encoder
+from topic_backends import make_topic_model, resolve_backend
+from sentiment_ci import group_sentiment_ci
+
 # ==========================
 # 설정
 # ==========================
@@ -19,6 +26,25 @@ TOP_TICKERS = 10          # 댓글 많은 종목 기준 상위 N개
 TOPICS_PER_TICKER = 8     # 각 종목에서 표시할 토픽 수(빈도 상위)
 MIN_DOCS_TICKER = 80      # 종목별 최소 문서 수(적으면 스킵)
 
+# 임베딩 워커 수: 2 이상이면 MiniLM 가중치를 한 번만 로드해 워커들이 공유(fork)
+EMBED_WORKERS = int(os.environ.get("EMBED_WORKERS", "1"))
+
+# 메모리 제한 모드: 고정 배치 인코딩 → 미리 잡은 float16 버퍼(학습 직전 float32 로 교체),
+# 인코딩 배치마다 / 토픽 학습 직후 / 종목 종료 후 RSS 상한 초과 시 MemoryError
+BOUNDED_MEMORY = False
+EMBED_BATCH = 256
+MAX_RSS_MB = 4096         # None이면 상한 없음
+
+# 차원축소/군집 백엔드: "auto" | "umap_hdbscan" | "ipca_kmeans" | "rp_kmeans"
+TOPIC_BACKEND = "auto"
+
+# 토픽별 mean_sent / pos_ratio 신뢰구간: "bayes"(Jeffreys 구간, 소표본에서도 폭 0 구간 없음) | "bootstrap" | None(생략)
+CI_METHOD = "bayes"
+N_BOOT = 2000
+
+# 종목별 토픽 요약 저장 형식: "csv" | "sqlite"(results/results.sqlite) | "both"
+OUTPUT_FORMAT = "csv"
+
 plt.rcParams["axes.unicode_minus"] = False
 try:
     plt.rcParams["font.family"] = "Malgun Gothic"
@@ -59,6 +85,18 @@ def plot_heatmap(mat: pd.DataFrame, title: str, filename: str):
     plt.colorbar()
     save_fig(os.path.join(OUT_DIR, filename))
 
+def encode_bounded(encode, docs, batch_size, max_rss_mb=None):
+    # 한 번에 전체를 인코딩하지 않고 배치 단위로 float16 버퍼에 채움
+    buf = None
+    for i in range(0, len(docs), batch_size):
+        emb = encode(docs[i:i + batch_size])
+        if buf is None:
+            buf = np.empty((len(docs), emb.shape[1]), dtype=np.float16)
+        buf[i:i + len(emb)] = emb
+        del emb
+        memory_stats.enforce_ceiling(max_rss_mb, f"임베딩 {i + batch_size}/{len(docs)}")
+    return buf
+
 def main():
     df = pd.read_csv(INPUT_PATH, encoding="utf-8")
     if "종목명" not in df.columns:
@@ -69,6 +107,9 @@ def main():
     sent_col = find_sentiment_col(df)
     df["_sent"] = normalize_sentiment(df[sent_col])
     df = df.dropna(subset=["_sent"]).copy()
+    if BOUNDED_MEMORY:
+        # 필요한 컬럼만 남김
+        df = df[["종목명", "제목_전처리", "_sent"]]
 
     # 분석할 종목 선택: 댓글 수 많은 TOP N
     ticker_counts = df["종목명"].value_counts()
@@ -78,15 +119,21 @@ def main():
     if len(tickers) == 0:
         raise ValueError("❌ 조건(MIN_DOCS_TICKER 등) 때문에 분석할 종목이 없습니다.")
 
-    embed_model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    encode, pool = embedding_encoder(
+        lambda: SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"),
+        EMBED_WORKERS,
+    )
 
     # 히트맵용 행을 만들기 위해 “TopicLabel”을 통일된 형태로 만들자:
     # 예) "T0(실적/호재)" 같은 문자열
     all_rows_score = []   # 평균 감성(-1~1)
     all_rows_pos = []     # 긍정비율(0~1)
     all_topic_tables = [] # 토픽 요약 테이블(보고서/부록용)
+    all_doc_topics = []   # 신뢰구간 계산용 (ticker, topic, sent)
+    memory_rows = []      # 종목별 최대 RSS
 
     for ticker in tickers:
+        memory_stats.reset_peak()
         sub = df[df["종목명"] == ticker].copy()
         if len(sub) < MIN_DOCS_TICKER:
             continue
@@ -95,10 +142,24 @@ def main():
         sent = sub["_sent"].astype(int).tolist()
 
         print(f"\n=== {ticker} BERTopic 학습 중 (n={len(docs)}) ===")
-        embeddings = embed_model.encode(docs, show_progress_bar=False)
-
-        topic_model = BERTopic(language="multilingual")
+        if BOUNDED_MEMORY:
+            embeddings = encode_bounded(encode, docs, EMBED_BATCH, MAX_RSS_MB)
+        else:
+            embeddings = encode(docs)
+
+        # float16 버퍼는 학습 전에 float32 로 한 번만 바꾸고 바로 버림
+        # (학습 중에는 float32 한 벌만 살아 있도록 → 버퍼를 같이 들고 있으면 1.5배)
+        embeddings = embeddings.astype(np.float32, copy=False)
+        if BOUNDED_MEMORY:
+            memory_stats.enforce_ceiling(MAX_RSS_MB, f"{ticker} 임베딩 변환")
+
+        start = time.perf_counter()
+        topic_model = make_topic_model(len(docs), TOPIC_BACKEND)
         topics, probs = topic_model.fit_transform(docs, embeddings)
+        print(f"  - 백엔드 {resolve_backend(TOPIC_BACKEND, len(docs))}: {time.perf_counter() - start:.1f}s")
+        if BOUNDED_MEMORY:
+            # 차원축소/군집 학습이 메모리를 가장 많이 씀 → 학습 직후 최대값 기준으로 확인
+            memory_stats.enforce_ceiling(MAX_RSS_MB, f"{ticker} 토픽 학습")
 
         tmp = pd.DataFrame({
             "doc": docs,
@@ -110,6 +171,8 @@ def main():
         tmp = tmp[tmp["topic"] != -1].copy()
         if len(tmp) == 0:
             print("  ⛔ 유효 토픽이 거의 없어 스킵")
+            del topic_model, embeddings
+            gc.collect()
             continue
 
         # 토픽별 통계
@@ -132,6 +195,12 @@ def main():
             short = "/".join(words[:2]) if len(words) >= 2 else (words[0] if words else "topic")
             topic_labels.append(f"{ticker} | T{tid}({short})")
 
+        all_doc_topics.append(pd.DataFrame({
+            "ticker": ticker,
+            "topic": tmp["topic"].values.astype(np.int32),
+            "sent": tmp["sent"].values.astype(np.int8),
+        }))
+
         agg["topic_label"] = topic_labels
         agg["top_words"] = top_words_list
         agg["ticker"] = ticker
@@ -152,9 +221,37 @@ def main():
             })
 
         # 종목별 토픽 요약 CSV 저장
-        out_csv = os.path.join(OUT_DIR, f"{safe_filename(ticker)}_topic_sentiment_table.csv")
-        agg.to_csv(out_csv, index=False, encoding="utf-8-sig")
-        print("  ✅ 저장:", out_csv)
+        if OUTPUT_FORMAT in ("csv", "both"):
+            out_csv = os.path.join(OUT_DIR, f"{safe_filename(ticker)}_topic_sentiment_table.csv")
+            agg.to_csv(out_csv, index=False, encoding="utf-8-sig")
+            print("  ✅ 저장:", out_csv)
+        if OUTPUT_FORMAT in ("sqlite", "both"):
+            results_store.write_table("topic_sentiment", agg, ticker=ticker)
+            print("  ✅ 저장:", results_store.DB_PATH)
+
+        # 종목별 모델/중간 결과 해제 → 다음 종목으로 메모리가 쌓이지 않게
+        n_docs = len(docs)
+        peak = memory_stats.peak_rss_mb()
+        del topic_model, embeddings, tmp, sub, docs, sent, topics, probs
+        gc.collect()
+        memory_rows.append({
+            "ticker": ticker,
+            "n": n_docs,
+            "peak_rss_mb": round(peak, 1) if peak else None,
+            "rss_after_release_mb": round(memory_stats.rss_mb() or 0, 1),
+        })
+        print(f"  - 최대 RSS {memory_rows[-1]['peak_rss_mb']}MB → 해제 후 {memory_rows[-1]['rss_after_release_mb']}MB")
+        if BOUNDED_MEMORY:
+            memory_stats.enforce_ceiling(MAX_RSS_MB, ticker)
+
+    if pool is not None:
+        pool.print_report()
+        pool.close()
+
+    if memory_rows:
+        mem_out = os.path.join(OUT_DIR, "memory_by_ticker.csv")
+        pd.DataFrame(memory_rows).to_csv(mem_out, index=False, encoding="utf-8-sig")
+        print("✅ 종목별 메모리 보고:", mem_out)
 
     # ==========================
     # 전체 히트맵 만들기
@@ -179,6 +276,17 @@ def main():
     # 전체 토픽 테이블 합치기(부록용)
     # ==========================
     full_table = pd.concat(all_topic_tables, axis=0, ignore_index=True)
+
+    # 신뢰구간: (종목, 토픽) 그룹 전체를 한 번에 리샘플링
+    if CI_METHOD:
+        docs_df = pd.concat(all_doc_topics, axis=0, ignore_index=True)
+        codes = docs_df.groupby(["ticker", "topic"], sort=False).ngroup().values
+        keys = docs_df.drop_duplicates(["ticker", "topic"])[["ticker", "topic"]]
+        keys = keys.iloc[np.argsort(codes[keys.index.values])].reset_index(drop=True)
+        ci = group_sentiment_ci(docs_df["sent"].values, codes, n_boot=N_BOOT, method=CI_METHOD)
+        ci = pd.concat([keys, ci.drop(columns=["n", "pos"])], axis=1)
+        full_table = full_table.merge(ci, on=["ticker", "topic"], how="left")
+
     full_out = os.path.join(OUT_DIR, "topic_sentiment_full_table.csv")
     full_table.to_csv(full_out, index=False, encoding="utf-8-sig")
     print("\n✅ 전체 토픽-감성 테이블 저장:", full_out)
@@ -0,0 +1,228 @@
+import os
+import glob
+import time
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn.functional as F
+from transformers import ElectraTokenizer, ElectraForSequenceClassification
+from sklearn.metrics import accuracy_score, f1_score
+from tqdm import tqdm
+
+# =======================================
+# 경로 설정
+# =======================================
+TEACHER_DIR = "../model/koelectra_binary_sentiment"
+STUDENT_DIR = "../model/koelectra_binary_sentiment_student"
+
+CORPUS_PATH = "../data/naver_board_kospi100_cleaned_final.csv"
+UNLABELED_GLOB = "../data/raw/*.csv"          # 추가 크롤링(라벨 없음) 데이터
+EVAL_PATH = "../data/balanced_2000_binary_dataset.csv"
+REPORT_PATH = "../results/evaluation/distill_tradeoff.csv"
+
+TEXT_COL = "제목_전처리"
+
+# =======================================
+# 증류 하이퍼파라미터
+# =======================================
+STUDENT_LAYERS = 4        # teacher 12층 → student 4~6층
+TEMPERATURE = 2.0
+EPOCHS = 3
+BATCH_SIZE = 32
+LR = 5e-5
+MAX_LENGTH = 128
+SEED = 42
+
+device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+print("사용 장치:", device)
+
+# =======================================
+# 데이터
+# =======================================
+def load_texts():
+    frames = [pd.read_csv(CORPUS_PATH, encoding="utf-8")]
+    for path in sorted(glob.glob(UNLABELED_GLOB)):
+        raw = pd.read_csv(path, encoding="utf-8")
+        if TEXT_COL in raw.columns:
+            print("  + 비라벨 크롤링 데이터:", path, len(raw))
+            frames.append(raw)
+
+    texts = pd.concat([f[[TEXT_COL]] for f in frames], ignore_index=True)[TEXT_COL]
+    texts = texts.dropna().astype(str).drop_duplicates()
+
+    # 평가셋(balanced 2000)은 증류 학습에서 제외 → 공정한 teacher/student 비교
+    eval_texts = set(pd.read_csv(EVAL_PATH, encoding="utf-8")[TEXT_COL].astype(str))
+    texts = texts[~texts.isin(eval_texts)]
+    return texts.tolist()
+
+def load_eval():
+    df = pd.read_csv(EVAL_PATH, encoding="utf-8")
+    texts = df[TEXT_COL].astype(str).tolist()
+    # 라벨이 0/1 또는 -1/1 어느 쪽이든 1 → 긍정
+    y = (df["label"] == 1).astype(int).values
+    return texts, y
+
+def batches(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# =======================================
+# Teacher soft label 생성
+# =======================================
+@torch.no_grad()
+def teacher_logits(texts, tokenizer, teacher):
+    out = []
+    for chunk in tqdm(list(batches(texts, 128)), desc="teacher"):
+        inputs = tokenizer(chunk, return_tensors="pt", truncation=True,
+                           padding=True, max_length=MAX_LENGTH)
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+        out.append(teacher(**inputs).logits.float().cpu())
+    return torch.cat(out, dim=0)
+
+# =======================================
+# Student 초기화 (teacher 층을 균등 간격으로 복사)
+# =======================================
+def build_student(teacher):
+    t_cfg = teacher.config
+    s_cfg = t_cfg.__class__.from_dict(t_cfg.to_dict())
+    s_cfg.num_hidden_layers = STUDENT_LAYERS
+
+    student = ElectraForSequenceClassification(s_cfg)
+
+    t_layers = t_cfg.num_hidden_layers
+    keep = np.linspace(0, t_layers - 1, STUDENT_LAYERS).round().astype(int).tolist()
+    print("teacher 층 → student 층:", {t: s for s, t in enumerate(keep)})
+
+    t_state = teacher.state_dict()
+    s_state = {}
+    for key, value in t_state.items():
+        if ".encoder.layer." in key:
+            prefix, rest = key.split(".encoder.layer.", 1)
+            idx, tail = rest.split(".", 1)
+            if int(idx) not in keep:
+                continue
+            key = f"{prefix}.encoder.layer.{keep.index(int(idx))}.{tail}"
+        s_state[key] = value.clone()
+
+    student.load_state_dict(s_state)
+    return student
+
+def distill_loss(student_logits, teacher_logits_batch):
+    t = TEMPERATURE
+    return F.kl_div(
+        F.log_softmax(student_logits / t, dim=-1),
+        F.softmax(teacher_logits_batch / t, dim=-1),
+        reduction="batchmean",
+    ) * (t * t)
+
+def train_student(student, tokenizer, texts, soft):
+    student.to(device)
+    student.train()
+    optimizer = torch.optim.AdamW(student.parameters(), lr=LR)
+    gen = torch.Generator().manual_seed(SEED)
+
+    for epoch in range(EPOCHS):
+        order = torch.randperm(len(texts), generator=gen).tolist()
+        total = 0.0
+        for idx in tqdm(list(batches(order, BATCH_SIZE)), desc=f"epoch {epoch + 1}/{EPOCHS}"):
+            inputs = tokenizer([texts[i] for i in idx], return_tensors="pt",
+                               truncation=True, padding=True, max_length=MAX_LENGTH)
+            inputs = {k: v.to(device) for k, v in inputs.items()}
+
+            loss = distill_loss(student(**inputs).logits, soft[idx].to(device))
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total += loss.item() * len(idx)
+        print(f"  epoch {epoch + 1} KD loss: {total / len(texts):.4f}")
+
+    student.eval()
+    return student
+
+# =======================================
+# 지연시간 / 정확도 비교
+# =======================================
+@torch.no_grad()
+def evaluate(name, model, tokenizer, texts, y):
+    model.to(device)
+    model.eval()
+
+    # 1) 단건 지연시간: 03의 predict()와 같은 방식(max_length 패딩, 1건씩)
+    latencies = []
+    for t in texts[:300]:
+        start = time.perf_counter()
+        inputs = tokenizer(t, return_tensors="pt", truncation=True,
+                           padding="max_length", max_length=MAX_LENGTH)
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+        model(**inputs).logits.argmax(dim=1).item()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # 2) 배치 처리량 + 정확도
+    preds = []
+    start = time.perf_counter()
+    for chunk in batches(texts, 64):
+        inputs = tokenizer(chunk, return_tensors="pt", truncation=True,
+                           padding=True, max_length=MAX_LENGTH)
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+        preds.extend(model(**inputs).logits.argmax(dim=1).cpu().tolist())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "model": name,
+        "layers": model.config.num_hidden_layers,
+        "params(M)": round(sum(p.numel() for p in model.parameters()) / 1e6, 2),
+        "latency_p50(ms)": round(float(np.percentile(latencies, 50)), 2),
+        "latency_p95(ms)": round(float(np.percentile(latencies, 95)), 2),
+        "throughput(texts/s)": round(len(texts) / elapsed, 1),
+        "accuracy": round(accuracy_score(y, preds), 4),
+        "macro_f1": round(f1_score(y, preds, average="macro"), 4),
+    }
+
+# =======================================
+# 메인
+# =======================================
+def main():
+    torch.manual_seed(SEED)
+
+    tokenizer = ElectraTokenizer.from_pretrained(TEACHER_DIR)
+    teacher = ElectraForSequenceClassification.from_pretrained(
+        TEACHER_DIR, local_files_only=True
+    )
+    teacher.to(device)
+    teacher.eval()
+
+    print("증류용 텍스트 로드 중...")
+    texts = load_texts()
+    print("학습 텍스트 수:", len(texts))
+
+    print("\nteacher soft label 생성 중...")
+    soft = teacher_logits(texts, tokenizer, teacher)
+
+    print(f"\nstudent({STUDENT_LAYERS}층) 학습 중...")
+    student = build_student(teacher)
+    student = train_student(student, tokenizer, texts, soft)
+
+    # predict()에서 그대로 쓸 수 있도록 tokenizer까지 함께 저장
+    os.makedirs(STUDENT_DIR, exist_ok=True)
+    student.save_pretrained(STUDENT_DIR)
+    tokenizer.save_pretrained(STUDENT_DIR)
+    print("\n✔ student 저장 완료 →", STUDENT_DIR)
+
+    print("\nbalanced 평가셋에서 teacher/student 비교 중...")
+    eval_texts, y = load_eval()
+    report = pd.DataFrame([
+        evaluate("teacher", teacher, tokenizer, eval_texts, y),
+        evaluate(f"student-{STUDENT_LAYERS}L", student, tokenizer, eval_texts, y),
+    ])
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    report.to_csv(REPORT_PATH, index=False, encoding="utf-8-sig")
+    print("\n=== 지연시간 / 정확도 비교 ===")
+    print(report.to_string(index=False))
+    print("\n✔ 저장 완료 →", REPORT_PATH)
+
+    print(f"\n👉 03에서 student 사용: SENTIMENT_MODEL_DIR={STUDENT_DIR} python 03_finetune_koelectra_binary.py")
+    print("\n완료 🎉")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import time
+import pandas as pd
+
+from title_index import TitleIndex
+
+# ==========================
+# 설정
+# ==========================
+INPUT_PATH = "../data/naver_board_kospi100_with_sentiment.csv"
+TOPIC_DIR = "../results/topic_modeling"
+INDEX_DIR = "../results/title_index"
+
+# 예시 질의: "삼성전자 / 공매도 언급 / 부정 / 토픽 3"
+EXAMPLE_QUERY = {
+    "all_terms": ["공매도*"],
+    "ticker": "삼성전자",
+    "sentiment": -1,
+    "topic": 3,
+}
+
+def find_sentiment_col(df):
+    cand = [c for c in df.columns if "sentiment" in c.lower()]
+    if cand:
+        return cand[-1]
+    if "label" in df.columns:
+        return "label"
+    raise KeyError("❌ sentiment 컬럼을 찾을 수 없음")
+
+def normalize_sentiment(series: pd.Series) -> pd.Series:
+    s = pd.to_numeric(series, errors="coerce")
+    uniq = set(pd.unique(s.dropna()))
+    if uniq.issubset({0, 1}):
+        s = s.map({0: -1, 1: 1})
+    return s
+
+def main():
+    print("데이터 로드 중...")
+    df = pd.read_csv(INPUT_PATH, encoding="utf-8")
+    sent = normalize_sentiment(df[find_sentiment_col(df)])
+
+    print("역색인 생성 중... (행:", len(df), ")")
+    start = time.perf_counter()
+    index = TitleIndex.build(df, sent, topic_dir=TOPIC_DIR)
+    index.save(INDEX_DIR)
+    print(f"✔ 저장 완료 → {INDEX_DIR} ({time.perf_counter() - start:.2f}s, "
+          f"단어 {len(index.vocab):,}개, 포스팅 {len(index.a['postings']) / 1e6:.2f}MB)")
+
+    # ==========================
+    # 예시 질의 (디스크에서 다시 로드)
+    # ==========================
+    index = TitleIndex.load(INDEX_DIR)
+    start = time.perf_counter()
+    rows = index.search(**EXAMPLE_QUERY)
+    facets = index.facets(index.search(all_terms=EXAMPLE_QUERY["all_terms"]))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"\n📌 예시 질의 {EXAMPLE_QUERY} → {len(rows)}건 ({elapsed:.1f}ms)")
+    print(index.frame(rows[:10]).to_string(index=False))
+
+    print("\n📌 '공매도' 언급 글 facet")
+    for name, counts in facets.items():
+        print(f"\n[{name}]")
+        print(counts.head(10).to_string())
+
+    print("\n🎉 완료!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import glob
+import time
+import pandas as pd
+
+import results_store
+
+# ==========================
+# 설정
+# ==========================
+TOPIC_DIR = "../results/topic_modeling"
+HEATMAP_DIR = "../results/topic_sentiment_heatmap"
+SUMMARY_PATH = "../results/sentiment_by_ticker.csv"
+DB_PATH = results_store.DB_PATH
+
+def strip_suffix(path: str, suffix: str) -> str:
+    return os.path.basename(path)[: -len(suffix)]
+
+# ==========================
+# 기존 CSV → SQLite 이관
+# ==========================
+def migrate():
+    n_files = 0
+
+    for path in sorted(glob.glob(os.path.join(TOPIC_DIR, "*_topics.csv"))):
+        ticker = strip_suffix(path, "_topics.csv")
+        docs_path = os.path.join(TOPIC_DIR, f"{ticker}_docs.csv")
+        topic_info = pd.read_csv(path, encoding="utf-8")
+        documents = pd.read_csv(docs_path, encoding="utf-8")
+        results_store.save_topic_model(ticker, topic_info, documents, db_path=DB_PATH)
+        n_files += 2
+
+    for path in sorted(glob.glob(os.path.join(HEATMAP_DIR, "*_topic_sentiment_table.csv"))):
+        table = pd.read_csv(path, encoding="utf-8")
+        if len(table) == 0:
+            continue
+        results_store.write_table("topic_sentiment", table, ticker=table["ticker"].iloc[0], db_path=DB_PATH)
+        n_files += 1
+
+    if os.path.exists(SUMMARY_PATH):
+        summary = pd.read_csv(SUMMARY_PATH, encoding="utf-8")
+        results_store.write_table("ticker_summary", summary, db_path=DB_PATH)
+        n_files += 1
+
+    return n_files
+
+def main():
+    print("CSV → SQLite 이관 중...")
+    start = time.perf_counter()
+    n_files = migrate()
+    print(f"✔ {n_files}개 CSV 이관 완료 → {DB_PATH} ({time.perf_counter() - start:.2f}s)")
+
+    # ==========================
+    # 확인: CSV와 동일한지 + 조회 시간
+    # ==========================
+    tickers = results_store.list_tickers(db_path=DB_PATH)
+    if not tickers:
+        print("⛔ 이관된 토픽 결과가 없습니다.")
+        return
+
+    ticker = tickers[0]
+    start = time.perf_counter()
+    docs = results_store.read_doc_topics(ticker, db_path=DB_PATH)
+    one_ms = (time.perf_counter() - start) * 1000
+
+    csv_docs = pd.read_csv(os.path.join(TOPIC_DIR, f"{ticker}_docs.csv"), encoding="utf-8")
+    same = docs.shape == csv_docs.shape and (docs.columns == csv_docs.columns).all()
+    print(f"\n📌 {ticker} 문서-토픽 {len(docs)}행 조회: {one_ms:.1f}ms (CSV와 형태 일치: {same})")
+
+    start = time.perf_counter()
+    all_docs = results_store.read_doc_topics(db_path=DB_PATH)
+    all_ms = (time.perf_counter() - start) * 1000
+    print(f"📌 전 종목 문서-토픽 {len(all_docs)}행 ({len(tickers)}종목) 조회: {all_ms:.1f}ms")
+
+    print("\n🎉 완료!")
+
+if __name__ == "__main__":
+    main()
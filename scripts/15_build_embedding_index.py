@@ -0,0 +1,99 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from ann_index import IVFIndex, brute_force_search, recall_at_k
+from title_index import load_row_topics
+
+# ==========================
+# 설정
+# ==========================
+INPUT_PATH = "../data/naver_board_kospi100_with_sentiment.csv"
+TOPIC_DIR = "../results/topic_modeling"
+EMBED_DIR = "../results/embeddings"          # 05가 저장한 종목별 임베딩(float16)
+INDEX_DIR = "../results/embedding_index"
+BENCH_PATH = os.path.join(INDEX_DIR, "benchmark.csv")
+
+EMBED_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+NLIST = None          # None이면 종목별 sqrt(n)
+NPROBE = 8
+K = 10
+N_QUERIES = 200       # 종목별 벤치마크 질의 수
+MIN_DOCS_BENCH = 150  # 이보다 작은 종목은 벤치마크 생략
+
+def load_embeddings(ticker, docs, model_holder):
+    path = os.path.join(EMBED_DIR, f"{ticker}.npy")
+    if os.path.exists(path):
+        emb = np.load(path)
+        if len(emb) == len(docs):
+            return emb
+
+    # 캐시가 없으면 그때만 SentenceTransformer 로드
+    if model_holder.get("model") is None:
+        from sentence_transformers import SentenceTransformer
+        model_holder["model"] = SentenceTransformer(EMBED_MODEL)
+    emb = model_holder["model"].encode(docs, show_progress_bar=False).astype(np.float16)
+    os.makedirs(EMBED_DIR, exist_ok=True)
+    np.save(path, emb)
+    return emb
+
+def benchmark(index, ticker, emb, ids, rng):
+    q_rows = rng.choice(len(emb), min(N_QUERIES, len(emb)), replace=False)
+    queries = emb[q_rows].astype(np.float32)
+
+    start = time.perf_counter()
+    exact = ids[brute_force_search(emb, queries, K)]
+    bf_qps = len(queries) / (time.perf_counter() - start)
+
+    rows = []
+    for nprobe in (1, 4, NPROBE, 16):
+        start = time.perf_counter()
+        approx, _ = index.search(ticker, queries, K, nprobe=nprobe)
+        qps = len(queries) / (time.perf_counter() - start)
+        rows.append({
+            "ticker": ticker,
+            "n": len(emb),
+            "nlist": len(index.parts[ticker].centroids),
+            "nprobe": nprobe,
+            f"recall@{K}": round(recall_at_k(approx, exact), 4),
+            "ann_qps": round(qps, 1),
+            "bruteforce_qps": round(bf_qps, 1),
+        })
+    return rows
+
+def main():
+    print("데이터 로드 중...")
+    df = pd.read_csv(INPUT_PATH, encoding="utf-8")
+    df["_topic"] = load_row_topics(df, TOPIC_DIR)
+
+    index = IVFIndex(nlist=NLIST, nprobe=NPROBE)
+    model_holder = {}
+    bench_rows = []
+    rng = np.random.default_rng(42)
+
+    for ticker, rows in df.groupby("종목명", sort=False).indices.items():
+        docs = df["제목_전처리"].iloc[rows].astype(str).tolist()
+        emb = load_embeddings(ticker, docs, model_holder)
+
+        index.add(ticker, emb, ids=rows, topics=df["_topic"].values[rows])
+        print(f"  ✔ {ticker}: {len(rows)}건 색인")
+
+        if len(rows) >= MIN_DOCS_BENCH:
+            bench_rows.extend(benchmark(index, ticker, emb, rows, rng))
+
+    index.save(INDEX_DIR)
+    print("\n✔ 색인 저장 완료 →", INDEX_DIR)
+
+    if bench_rows:
+        bench = pd.DataFrame(bench_rows)
+        bench.to_csv(BENCH_PATH, index=False, encoding="utf-8-sig")
+        print(f"\n📌 recall@{K} / QPS (IVF vs brute force)")
+        print(bench.to_string(index=False))
+        print("\n✔ 저장 완료 →", BENCH_PATH)
+
+    print("\n🎉 완료!")
+
+if __name__ == "__main__":
+    main()
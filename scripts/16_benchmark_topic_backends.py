@@ -0,0 +1,74 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from sentence_transformers import SentenceTransformer
+
+from topic_backends import BACKENDS, make_topic_model, topic_coherence
+
+# ==========================
+# 설정
+# ==========================
+INPUT_PATH = "../data/naver_board_kospi100_with_sentiment.csv"
+EMBED_DIR = "../results/embeddings"          # 05가 저장한 종목별 임베딩(있으면 재사용)
+OUT_DIR = "../results/topic_backends"
+OUT_PATH = os.path.join(OUT_DIR, "backend_benchmark.csv")
+
+TOP_TICKERS = 10          # 문서 수 상위 N개 종목
+MIN_DOCS_TICKER = 80
+
+EMBED_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+def load_embeddings(ticker, docs, embed_model):
+    path = os.path.join(EMBED_DIR, f"{ticker}.npy")
+    if os.path.exists(path):
+        emb = np.load(path)
+        if len(emb) == len(docs):
+            return emb.astype(np.float32)
+    return embed_model.encode(docs, show_progress_bar=False)
+
+def main():
+    df = pd.read_csv(INPUT_PATH, encoding="utf-8")
+    counts = df["종목명"].value_counts()
+    tickers = [t for t in counts.head(TOP_TICKERS).index if counts[t] >= MIN_DOCS_TICKER]
+    print("벤치마크 종목:", tickers)
+
+    embed_model = SentenceTransformer(EMBED_MODEL)
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+    rows = []
+    for ticker in tickers:
+        docs = df.loc[df["종목명"] == ticker, "제목_전처리"].astype(str).tolist()
+        embeddings = load_embeddings(ticker, docs, embed_model)
+        print(f"\n=== {ticker} (n={len(docs)}) ===")
+
+        for backend in BACKENDS:
+            start = time.perf_counter()
+            topic_model = make_topic_model(len(docs), backend)
+            topics, _ = topic_model.fit_transform(docs, embeddings)
+            elapsed = time.perf_counter() - start
+
+            topics = np.asarray(topics)
+            rows.append({
+                "ticker": ticker,
+                "n_docs": len(docs),
+                "backend": backend,
+                "runtime_s": round(elapsed, 2),
+                "n_topics": int(len(set(topics.tolist()) - {-1})),
+                "outlier_ratio": round(float((topics == -1).mean()), 4),
+                "coherence_npmi": round(topic_coherence(topic_model, docs), 4),
+            })
+            print(f"  {backend:>13}: {elapsed:6.2f}s, 토픽 {rows[-1]['n_topics']}개, "
+                  f"NPMI {rows[-1]['coherence_npmi']}")
+
+    result = pd.DataFrame(rows)
+    result.to_csv(OUT_PATH, index=False, encoding="utf-8-sig")
+    print("\n✅ 저장:", OUT_PATH)
+
+    print("\n📌 백엔드별 평균")
+    print(result.groupby("backend")[["runtime_s", "n_topics", "coherence_npmi"]].mean().round(3).to_string())
+
+    print("\n🎉 완료!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+샤드 단위 분산 감성 스코어링 (여러 노드 / 로컬 프로세스)
+
+    python 17_sharded_scoring.py plan                 # 입력 → 샤드 분할 + manifest.json
+    python 17_sharded_scoring.py work                 # 워커: 샤드 lease → 스코어링 → 샤드별 출력
+    python 17_sharded_scoring.py merge                # 샤드 출력 → _with_sentiment CSV
+    python 17_sharded_scoring.py status
+    python 17_sharded_scoring.py run --workers 4      # plan + 로컬 워커 4개 + merge
+
+- 샤드 ID = 샤드 내용(CSV 바이트)의 sha256 → 같은 입력으로 재실행하면 출력이 있는 샤드는 건너뜀
+- 모델 ID = 감성 모델 폴더(03의 MODEL_DIR / SENTIMENT_MODEL_DIR) 파일 내용의 sha256
+  · plan 이 manifest 에 기록, 출력/lease 는 out/{모델 ID}/, leases/{모델 ID}/ 아래
+    → 모델을 바꿔 다시 plan 하면 이전 모델 출력은 건너뛰지도 병합되지도 않음
+  · work 는 로컬 모델 ID 가 manifest 와 다르면 샤드를 잡지 않고 종료 (노드마다 다른 모델 방지)
+- lease: leases/{id}.lease 파일 (생성/탈취는 파일 잠금 안에서만), 워커는 스코어링 중 주기적으로 갱신
+  · 갱신이 LEASE_TTL 동안 끊긴 lease(죽은 워커)는 다른 워커가 다시 가져감
+  · 남은 샤드가 모두 lease 중이면, STRAGGLER_AFTER 이상 붙잡힌 샤드를 유휴 워커가 중복 실행
+    (출력은 임시 파일 → os.link 로 최종 경로에 한 번만 생성 → 먼저 끝난 쪽 결과가 유지되고 늦은 쪽은 버림)
+- 여러 노드에서 쓰려면 --work-dir 을 공유 파일시스템 경로로 지정
+"""
+import os
+import io
+import json
+import time
+import socket
+import hashlib
+import argparse
+import threading
+import importlib.util
+import multiprocessing as mp
+from contextlib import contextmanager
+import pandas as pd
+
+# ==========================
+# 설정
+# ==========================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUT_PATH = os.path.join(BASE_DIR, "..", "data", "naver_board_kospi100_cleaned_final.csv")
+OUTPUT_PATH = os.path.join(BASE_DIR, "..", "data", "naver_board_kospi100_with_sentiment.csv")
+WORK_DIR = os.path.join(BASE_DIR, "..", "data", "shards")
+SCORER_PATH = os.path.join(BASE_DIR, "03_finetune_koelectra_binary.py")
+
+TEXT_COL = "제목_전처리"
+SHARD_SIZE = 2000         # 샤드당 행 수
+LEASE_TTL = 120           # 초: 이 시간 동안 갱신 없는 lease는 만료
+STRAGGLER_AFTER = 900     # 초: 이보다 오래 걸리는 샤드는 유휴 워커가 중복 실행
+POLL_INTERVAL = 5
+
+# ==========================
+# 경로 / 잠금
+# ==========================
+def paths(work_dir, model_id):
+    return {
+        "manifest": os.path.join(work_dir, "manifest.json"),
+        "shards": os.path.join(work_dir, "shards"),
+        "leases": os.path.join(work_dir, "leases", model_id),
+        "out": os.path.join(work_dir, "out", model_id),
+        "lock": os.path.join(work_dir, "leases.lock"),
+    }
+
+@contextmanager
+def file_lock(path):
+    with open(path, "a+") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def write_atomic(path, data: bytes):
+    tmp = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def publish_once(path, data: bytes) -> bool:
+    """임시 파일 → os.link: 최종 경로가 이미 있으면 실패(False) → 먼저 끝난 쪽 결과만 남음"""
+    tmp = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    try:
+        os.link(tmp, path)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        os.remove(tmp)
+
+def load_manifest(work_dir):
+    with open(os.path.join(work_dir, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+# ==========================
+# 모델 ID
+# ==========================
+def scorer_module():
+    # 03 모듈의 MODEL_DIR / load_model / predict 를 그대로 사용 (SENTIMENT_MODEL_DIR 로 student 지정 가능)
+    spec = importlib.util.spec_from_file_location("finetune_koelectra_binary", SCORER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def model_fingerprint(model_dir):
+    """모델 폴더의 파일 이름 + 크기 + 내용 sha256 앞 16자 (경로가 달라도 같은 가중치면 같은 ID)"""
+    if not os.path.isdir(model_dir):
+        raise FileNotFoundError(f"❌ 감성 모델 폴더 없음: {model_dir}")
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(model_dir)):
+        path = os.path.join(model_dir, name)
+        if not os.path.isfile(path):
+            continue
+        h.update(f"{name}\0{os.path.getsize(path)}\0".encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()[:16]
+
+def manifest_model_id(manifest):
+    model = manifest.get("model")
+    if not model:
+        raise RuntimeError("❌ manifest 에 모델 ID 가 없음 (이전 버전 manifest) → plan 다시 실행")
+    return model["id"]
+
+# ==========================
+# 1) plan: 샤드 분할 + manifest
+# ==========================
+def plan(work_dir, input_path=INPUT_PATH, shard_size=SHARD_SIZE):
+    model_dir = os.path.abspath(scorer_module().MODEL_DIR)
+    model_id = model_fingerprint(model_dir)
+    p = paths(work_dir, model_id)
+    for key in ("shards", "leases", "out"):
+        os.makedirs(p[key], exist_ok=True)
+
+    df = pd.read_csv(input_path, encoding="utf-8")
+    if TEXT_COL not in df.columns:
+        raise KeyError(f"❌ '{TEXT_COL}' 컬럼이 CSV에 없음!")
+
+    shards = []
+    for i, start in enumerate(range(0, len(df), shard_size)):
+        buf = io.StringIO()
+        df.iloc[start:start + shard_size].to_csv(buf, index=False)
+        data = buf.getvalue().encode("utf-8")
+        shard_id = hashlib.sha256(data).hexdigest()[:20]
+
+        shard_path = os.path.join(p["shards"], f"{shard_id}.csv")
+        if not os.path.exists(shard_path):
+            write_atomic(shard_path, data)
+        shards.append({"id": shard_id, "index": i, "rows": int(min(shard_size, len(df) - start))})
+
+    manifest = {
+        "input": os.path.abspath(input_path),
+        "text_col": TEXT_COL,
+        "shard_size": shard_size,
+        "total_rows": int(len(df)),
+        "model": {"id": model_id, "dir": model_dir},
+        "shards": shards,
+    }
+    write_atomic(p["manifest"], json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    done = sum(os.path.exists(os.path.join(p["out"], f"{s['id']}.csv")) for s in shards)
+    print(f"✔ manifest 저장 → {p['manifest']} (샤드 {len(shards)}개, 이미 완료 {done}개, 모델 {model_id})")
+    return manifest
+
+# ==========================
+# 2) lease
+# ==========================
+def read_lease(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            lease = json.load(f)
+        lease["age"] = time.time() - os.path.getmtime(path)
+        return lease
+    except (FileNotFoundError, ValueError):
+        return None
+
+def try_claim(work_dir, model_id, shard_id, worker_id, allow_straggler=False):
+    p = paths(work_dir, model_id)
+    lease_path = os.path.join(p["leases"], f"{shard_id}.lease")
+    with file_lock(p["lock"]):
+        if os.path.exists(os.path.join(p["out"], f"{shard_id}.csv")):
+            return False
+        lease = read_lease(lease_path)
+        if lease is not None:
+            expired = lease["age"] > LEASE_TTL
+            straggler = allow_straggler and time.time() - lease["started"] > STRAGGLER_AFTER
+            if not (expired or straggler):
+                return False
+            why = "만료" if expired else "지연"
+            print(f"  ↻ [{worker_id}] {shard_id} 재할당 ({why}, 이전 워커 {lease['worker']})")
+        record = {"worker": worker_id, "started": time.time()}
+        write_atomic(lease_path, json.dumps(record).encode("utf-8"))
+        return True
+
+def release(work_dir, model_id, shard_id, worker_id):
+    p = paths(work_dir, model_id)
+    lease_path = os.path.join(p["leases"], f"{shard_id}.lease")
+    with file_lock(p["lock"]):
+        lease = read_lease(lease_path)
+        if lease is not None and lease["worker"] == worker_id:
+            os.remove(lease_path)
+
+class Heartbeat(threading.Thread):
+    """스코어링하는 동안 lease 파일 mtime 갱신"""
+    def __init__(self, lease_path):
+        super().__init__(daemon=True)
+        self.lease_path = lease_path
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(LEASE_TTL / 4):
+            try:
+                os.utime(self.lease_path)
+            except FileNotFoundError:
+                return
+
+    def stop(self):
+        self.stop_event.set()
+
+# ==========================
+# 3) work: 워커 루프
+# ==========================
+def load_scorer(module):
+    tokenizer, model = module.load_model()
+    return lambda texts: module.predict(texts, tokenizer, model)
+
+def score_shard(work_dir, model_id, shard_id, score_fn) -> bool:
+    """샤드 스코어링 → out/{모델 ID}/{샤드 ID}.csv, 다른 워커가 먼저 썼으면 False"""
+    p = paths(work_dir, model_id)
+    df = pd.read_csv(os.path.join(p["shards"], f"{shard_id}.csv"), encoding="utf-8")
+    df["sentiment_binary"] = score_fn(df[TEXT_COL].astype(str).tolist())
+    return publish_once(os.path.join(p["out"], f"{shard_id}.csv"), df.to_csv(index=False).encode("utf-8"))
+
+def work(work_dir, worker_id=None):
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    manifest = load_manifest(work_dir)
+    model_id = manifest_model_id(manifest)
+
+    # 이 노드의 모델이 plan 때 모델과 다르면 샤드를 잡기 전에 중단 (서로 다른 모델 라벨이 섞이지 않게)
+    module = scorer_module()
+    local_id = model_fingerprint(module.MODEL_DIR)
+    if local_id != model_id:
+        raise RuntimeError(f"❌ [{worker_id}] 모델 불일치: 로컬 {local_id} ({module.MODEL_DIR}) "
+                           f"!= manifest {model_id} ({manifest['model']['dir']})")
+
+    p = paths(work_dir, model_id)
+    os.makedirs(p["out"], exist_ok=True)
+    os.makedirs(p["leases"], exist_ok=True)
+    score_fn = None
+    n_done = 0
+
+    while True:
+        pending = [s["id"] for s in manifest["shards"]
+                   if not os.path.exists(os.path.join(p["out"], f"{s['id']}.csv"))]
+        if not pending:
+            break
+
+        # lease 를 잡기 전에 모델부터 로드 (로드 실패로 샤드가 LEASE_TTL 동안 묶이지 않게)
+        if score_fn is None:
+            score_fn = load_scorer(module)
+
+        claimed = next((sid for sid in pending if try_claim(work_dir, model_id, sid, worker_id)), None)
+        if claimed is None:
+            # 남은 샤드가 전부 lease 중 → 오래 걸리는 샤드 중복 실행
+            claimed = next((sid for sid in pending
+                            if try_claim(work_dir, model_id, sid, worker_id, allow_straggler=True)), None)
+        if claimed is None:
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        heartbeat = Heartbeat(os.path.join(p["leases"], f"{claimed}.lease"))
+        heartbeat.start()
+        start = time.perf_counter()
+        try:
+            first = score_shard(work_dir, model_id, claimed, score_fn)
+        finally:
+            heartbeat.stop()
+            release(work_dir, model_id, claimed, worker_id)
+        if not first:
+            print(f"  · [{worker_id}] {claimed} 다른 워커가 먼저 완료 → 이 결과는 버림")
+            continue
+        n_done += 1
+        print(f"  ✔ [{worker_id}] {claimed} 완료 ({time.perf_counter() - start:.1f}s, 남은 샤드 {len(pending) - 1})")
+
+    print(f"🎉 [{worker_id}] 처리할 샤드 없음 → 종료 (이 워커 처리 {n_done}개)")
+
+# ==========================
+# 4) merge / status
+# ==========================
+def merge(work_dir, output_path=OUTPUT_PATH):
+    manifest = load_manifest(work_dir)
+    p = paths(work_dir, manifest_model_id(manifest))
+    missing = [s["id"] for s in manifest["shards"]
+               if not os.path.exists(os.path.join(p["out"], f"{s['id']}.csv"))]
+    if missing:
+        raise RuntimeError(f"❌ 아직 출력이 없는 샤드 {len(missing)}개: {missing[:5]} ...")
+
+    frames = [pd.read_csv(os.path.join(p["out"], f"{s['id']}.csv"), encoding="utf-8")
+              for s in manifest["shards"]]
+    df = pd.concat(frames, axis=0, ignore_index=True)
+    if len(df) != manifest["total_rows"]:
+        raise RuntimeError(f"❌ 행 수 불일치: {len(df)} != {manifest['total_rows']}")
+
+    df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    print(f"✔ 병합 완료 → {output_path} ({len(df)}행, 모델 {manifest['model']['id']})")
+
+def status(work_dir):
+    manifest = load_manifest(work_dir)
+    p = paths(work_dir, manifest_model_id(manifest))
+    done = leased = expired = 0
+    for s in manifest["shards"]:
+        if os.path.exists(os.path.join(p["out"], f"{s['id']}.csv")):
+            done += 1
+            continue
+        lease = read_lease(os.path.join(p["leases"], f"{s['id']}.lease"))
+        if lease is None:
+            continue
+        if lease["age"] > LEASE_TTL:
+            expired += 1
+        else:
+            leased += 1
+    total = len(manifest["shards"])
+    print(f"샤드 {total}개: 완료 {done} / 처리 중 {leased} / 만료 lease {expired} / "
+          f"대기 {total - done - leased - expired}")
+
+def run_local(work_dir, n_workers, input_path=INPUT_PATH, output_path=OUTPUT_PATH, shard_size=SHARD_SIZE):
+    plan(work_dir, input_path, shard_size)
+    procs = [mp.Process(target=work, args=(work_dir, f"local-{i}")) for i in range(n_workers)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    merge(work_dir, output_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="샤드 단위 분산 감성 스코어링")
+    parser.add_argument("command", choices=["plan", "work", "merge", "status", "run"])
+    parser.add_argument("--work-dir", default=WORK_DIR, help="manifest/샤드/lease/출력 폴더 (노드 간 공유 경로)")
+    parser.add_argument("--input", default=INPUT_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--workers", type=int, default=2, help="run: 로컬 워커 프로세스 수")
+    args = parser.parse_args()
+
+    if args.command == "plan":
+        plan(args.work_dir, args.input, args.shard_size)
+    elif args.command == "work":
+        work(args.work_dir, args.worker_id)
+    elif args.command == "merge":
+        merge(args.work_dir, args.output)
+    elif args.command == "status":
+        status(args.work_dir)
+    else:
+        run_local(args.work_dir, args.workers, args.input, args.output, args.shard_size)
+
+if __name__ == "__main__":
+    main()
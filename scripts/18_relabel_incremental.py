@@ -0,0 +1,154 @@
+"""
+사전 변경분만 다시 라벨링 (02의 증분 버전)
+
+    python 18_relabel_incremental.py                    # 최신 사전(v*.json)과 마지막 상태의 차이만 반영
+    python 18_relabel_incremental.py --lexicon ../data/lexicon/v3.json
+    python 18_relabel_incremental.py --full             # 상태를 버리고 전체 재계산
+
+- 상태(STATE_DIR): 행별/범주별 포함 단어 수(counts.*.npy), 문자 bigram → 행 색인, 마지막으로 반영한 사전
+  (state.json 이 그때의 counts 파일 이름을 가리킴 → counts 와 사전이 항상 같은 시점)
+- 추가/삭제된 단어마다 색인으로 후보 행만 찾아 포함 여부 확인 → 해당 범주 카운트 ±1
+  → 라벨 규칙은 counts 전체에 벡터로 재적용 (02와 결과 동일)
+- 라벨은 매번 상태의 counts 전체에서 다시 계산해 full CSV 와 비교 → 다른 행이 있을 때만 full CSV 를 다시 씀
+  balanced 는 라벨이 바뀌었거나 사전 버전이 상태와 다르거나 파일이 없으면 재생성 (02와 같은 시드로 결정적)
+- 중간에 죽어도 안전하도록 모든 파일은 임시 파일 → os.replace, 순서는 balanced → full → 상태(state.json 마지막)
+  → 상태가 갱신되기 전에 죽으면 다음 실행이 같은 차이를 다시 적용해 남은 파일을 마저 맞춤
+- 입력 제목이 바뀌면(행 수 / 해시 불일치) 자동으로 전체 재계산
+"""
+import os
+import json
+import time
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+
+from lexicon import (load_lexicon, latest_lexicon_path, diff_lexicon, normalize_texts,
+                     count_hits, label_from_counts, make_balanced, BigramIndex, CATEGORIES)
+
+# ==========================
+# 설정
+# ==========================
+FULL_PATH = "../data/naver_board_kospi100_labeled_full_17k.csv"
+BALANCED_OUTPUT = "../data/balanced_2000_binary_dataset.csv"
+STATE_DIR = "../data/lexicon/state"
+
+TEXT_COL = "제목_전처리"
+
+def text_hash(texts: pd.Series) -> str:
+    return hashlib.sha1(pd.util.hash_pandas_object(texts, index=False).to_numpy().tobytes()).hexdigest()
+
+def load_state(state_dir):
+    meta_path = os.path.join(state_dir, "state.json")
+    if not os.path.exists(meta_path) or not BigramIndex.exists(state_dir):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    counts = np.load(os.path.join(state_dir, meta["counts_file"]))
+    return meta, counts
+
+def write_atomic(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+def write_csv_atomic(df, path):
+    write_atomic(path, lambda f: df.to_csv(f, index=False, encoding="utf-8-sig"))
+
+def save_state(state_dir, meta, counts, index=None):
+    # counts 는 새 이름으로 쓰고 state.json 교체를 "커밋" 시점으로 사용
+    # → 중간에 죽으면 이전 state.json 이 이전 counts 를 그대로 가리킴
+    os.makedirs(state_dir, exist_ok=True)
+    if index is not None:
+        index.save(state_dir)
+    meta = dict(meta, counts_file=f"counts.{time.time_ns()}.npy")
+    write_atomic(os.path.join(state_dir, meta["counts_file"]), lambda f: np.save(f, counts))
+    write_atomic(os.path.join(state_dir, "state.json"),
+                 lambda f: f.write(json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")))
+    for fname in os.listdir(state_dir):
+        if fname.startswith("counts.") and fname != meta["counts_file"]:
+            os.remove(os.path.join(state_dir, fname))
+
+def apply_changes(index, texts, counts, changes):
+    """사전 차이 → counts 갱신, 영향 받은 행 번호 반환"""
+    touched = []
+    for ci, term, sign in changes:
+        rows = index.rows_containing(term, texts)
+        counts[rows, ci] += sign
+        touched.append(rows)
+        print(f"  {'+' if sign > 0 else '-'} {CATEGORIES[ci]:<10} {term:<10} {len(rows):>8,}행")
+    return np.unique(np.concatenate(touched)) if touched else np.empty(0, dtype=np.int64)
+
+def main():
+    parser = argparse.ArgumentParser(description="사전 변경분만 증분 라벨링")
+    parser.add_argument("--lexicon", default=None, help="사전 파일 (기본: 가장 높은 버전)")
+    parser.add_argument("--full", action="store_true", help="상태를 무시하고 전체 재계산")
+    args = parser.parse_args()
+
+    lexicon_path = args.lexicon or latest_lexicon_path()
+    lexicon = load_lexicon(lexicon_path)
+
+    if not os.path.exists(FULL_PATH):
+        raise FileNotFoundError(f"❌ {FULL_PATH} 없음 → 먼저 02_make_binary_dataset.py 실행")
+
+    t0 = time.perf_counter()
+    df = pd.read_csv(FULL_PATH, encoding="utf-8")
+    texts = normalize_texts(df[TEXT_COL])
+    fingerprint = text_hash(texts)
+    t_load = time.perf_counter() - t0
+
+    state = None if args.full else load_state(STATE_DIR)
+    if state is not None:
+        meta, counts = state
+        if meta["n_rows"] != len(df) or meta["text_hash"] != fingerprint:
+            print("⚠ 입력 제목이 상태와 다름 → 전체 재계산")
+            state = None
+
+    t0 = time.perf_counter()
+    if state is None:
+        print(f"전체 라벨링 + 색인 생성 중... (행 {len(df):,}, 사전 {lexicon_path})")
+        counts = count_hits(texts, lexicon)
+        index = BigramIndex.build(texts)
+        lexicon_changed = True
+        affected = len(df)
+    else:
+        index = BigramIndex.load(STATE_DIR)
+        changes = diff_lexicon(meta["lexicon"], lexicon)
+        print(f"사전 {meta['lexicon_path']} → {lexicon_path}: 변경 단어 {len(changes)}개")
+        affected = len(apply_changes(index, texts.tolist(), counts, changes))
+        lexicon_changed = bool(changes)
+        index = None   # 색인은 제목이 같으면 그대로
+
+    # 전체 행을 counts 에서 다시 판정 (벡터 연산) → 지난 실행이 full CSV 를 못 쓰고 죽었어도 맞춰짐
+    labels = label_from_counts(counts)
+    changed = np.flatnonzero(pd.to_numeric(df["label"], errors="coerce").to_numpy() != labels)
+    t_relabel = time.perf_counter() - t0
+
+    print(f"✔ 영향 행 {affected:,} / 라벨 변경 {len(changed):,} "
+          f"(로드 {t_load:.2f}s, 라벨링 {t_relabel:.2f}s)")
+
+    df["label"] = labels
+    if len(changed) or lexicon_changed or not os.path.exists(BALANCED_OUTPUT):
+        t0 = time.perf_counter()
+        balanced, n = make_balanced(df, TEXT_COL)
+        write_csv_atomic(balanced, BALANCED_OUTPUT)
+        print(f"✔ 저장 → {BALANCED_OUTPUT} (긍정/부정 {n}개씩, {time.perf_counter() - t0:.2f}s)")
+
+    if len(changed):
+        t0 = time.perf_counter()
+        write_csv_atomic(df, FULL_PATH)
+        print(f"✔ 저장 → {FULL_PATH} ({time.perf_counter() - t0:.2f}s)")
+        print("\n라벨 분포:")
+        print(df["label"].value_counts())
+
+    save_state(STATE_DIR, {
+        "lexicon_path": lexicon_path,
+        "lexicon": lexicon,
+        "n_rows": len(df),
+        "text_hash": fingerprint,
+    }, counts, index)
+    print("✔ 상태 저장 →", STATE_DIR)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+스트리밍 파이프라인: 원본 게시글 → 정제 → 중복 제거 → 토큰화 → 감성 스코어링 → 임베딩 → 토픽 배정
+
+    python 19_stream_pipeline.py                          # 입력 파일을 끝까지 흘려보내고 종료
+    python 19_stream_pipeline.py --follow                 # 파일 끝에 새 글이 붙으면 계속 처리 (Ctrl+C 종료)
+    python 19_stream_pipeline.py --batch-size 32 --queue-size 4
+
+- 단계마다 asyncio 코루틴 + 크기 제한 큐(queue-size 배치)로 연결 → 뒤 단계가 밀리면 앞 단계가 기다림(backpressure)
+  → 파일 크기와 관계없이 메모리에 올라가는 배치 수는 (단계 수 x queue-size) 이하
+- 파일 읽기/쓰기는 asyncio.to_thread, CPU 단계(토큰화·모델·임베딩·토픽)는 단계별 스레드 풀
+  (토큰화는 Rust 구현 ElectraTokenizerFast, torch / numpy 도 연산 중 GIL을 놓으므로 단계들이 실제로 겹쳐 실행됨)
+- 따옴표 안 줄바꿈이 있는 제목은 여러 줄을 한 레코드로 합쳐 읽고, 컬럼 수가 헤더와 다른 레코드는 버린 수를 따로 보고
+- 감성 모델은 03의 load_model (SENTIMENT_MODEL_DIR 로 student 지정 가능),
+  토픽은 15가 만든 임베딩 ANN 색인의 이웃 토픽 다수결 (색인이 없으면 임베딩/토픽 단계 생략)
+- REPORT_EVERY 초마다 단계별 처리량 / 입력 큐 깊이 / RSS, 종료 시 단계별 요약과 게시글 지연(p50/p95) 보고
+"""
+import os
+import re
+import csv
+import time
+import asyncio
+import argparse
+import importlib.util
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+import memory_stats
+from ann_index import IVFIndex, NO_TOPIC
+
+# ==========================
+# 설정
+# ==========================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUT_PATH = os.path.join(BASE_DIR, "..", "data", "raw", "naver_board_kospi100_cleaned.csv")
+OUTPUT_PATH = os.path.join(BASE_DIR, "..", "data", "stream", "naver_board_stream_scored.csv")
+STATS_PATH = os.path.join(BASE_DIR, "..", "results", "stream", "stage_stats.csv")
+INDEX_DIR = os.path.join(BASE_DIR, "..", "results", "embedding_index")
+SCORER_PATH = os.path.join(BASE_DIR, "03_finetune_koelectra_binary.py")
+
+EMBED_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+TEXT_COL = "제목_전처리"
+RAW_TEXT_COL = "제목"
+TICKER_COL = "종목명"
+
+BATCH_SIZE = 64           # 배치당 최대 행 수 (--follow 에서는 새로 붙은 만큼만 바로 보냄)
+QUEUE_SIZE = 8            # 단계 사이 큐에 쌓일 수 있는 배치 수
+DEDUP_WINDOW = 200_000    # 중복 판정에 기억하는 최근 (종목, 제목) 수
+POLL_INTERVAL = 0.5       # 초: --follow 에서 파일 끝 확인 주기
+REPORT_EVERY = 5          # 초
+MAX_LENGTH = 128
+
+# 원본 제목 정제: 03/05 입력(제목_전처리)과 같은 문자 집합 (한글 음절 + 영문)
+URL_RE = re.compile(r"https?://\S+|www\.\S+")
+NOISE_RE = re.compile(r"[^가-힣A-Za-z\s]")
+
+# ==========================
+# 단계 함수 (스레드 풀에서 실행)
+# ==========================
+def clean(batch: pd.DataFrame) -> pd.DataFrame:
+    if TEXT_COL in batch.columns:
+        text = batch[TEXT_COL].fillna("").astype(str)
+    else:
+        text = batch[RAW_TEXT_COL].fillna("").astype(str)
+        text = text.str.replace(URL_RE, " ", regex=True).str.replace(NOISE_RE, " ", regex=True)
+    text = text.str.split().str.join(" ")
+    out = batch.assign(**{TEXT_COL: text})
+    return out[out[TEXT_COL].str.len() > 0]
+
+class Dedup:
+    """최근 DEDUP_WINDOW 개의 (종목, 제목)만 기억하는 LRU → 메모리 일정"""
+
+    def __init__(self, window: int = DEDUP_WINDOW):
+        self.window = window
+        self.seen = OrderedDict()
+
+    def __call__(self, batch: pd.DataFrame) -> pd.DataFrame:
+        keep = np.zeros(len(batch), dtype=bool)
+        for i, key in enumerate(zip(batch[TICKER_COL], batch[TEXT_COL])):
+            if key in self.seen:
+                self.seen.move_to_end(key)
+                continue
+            keep[i] = True
+            self.seen[key] = None
+            if len(self.seen) > self.window:
+                self.seen.popitem(last=False)
+        return batch[keep]
+
+def load_scorer():
+    # 03의 load_model / device 를 그대로 사용, 토크나이저만 fast 버전
+    # (03의 ElectraTokenizer 는 순수 Python → GIL을 잡고 있어 이벤트 루프/스코어링 스레드와 경합)
+    from transformers import ElectraTokenizerFast
+
+    spec = importlib.util.spec_from_file_location("finetune_koelectra_binary", SCORER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _, model = module.load_model()
+    tokenizer = ElectraTokenizerFast.from_pretrained(module.MODEL_DIR)
+    return tokenizer, model, module.device
+
+def make_tokenize(tokenizer):
+    def tokenize(batch):
+        enc = tokenizer(batch[TEXT_COL].tolist(), return_tensors="pt", truncation=True,
+                        padding=True, max_length=MAX_LENGTH)
+        return batch, enc
+    return tokenize
+
+def make_score(model, device):
+    import torch
+
+    def score(item):
+        batch, enc = item
+        with torch.no_grad():
+            logits = model(**{k: v.to(device) for k, v in enc.items()}).logits
+        pred = logits.argmax(dim=1).cpu().numpy()
+        # 0 → 부정(-1), 1 → 긍정(+1)
+        return batch.assign(sentiment_binary=np.where(pred == 1, 1, -1))
+    return score
+
+def make_embed(encoder):
+    def embed(batch):
+        emb = encoder.encode(batch[TEXT_COL].tolist(), show_progress_bar=False,
+                             batch_size=max(len(batch), 1))
+        return batch, emb.astype(np.float32)
+    return embed
+
+def make_assign_topics(index):
+    def assign(item):
+        batch, emb = item
+        topics = np.full(len(batch), NO_TOPIC, dtype=np.int32)
+        for ticker, rows in batch.groupby(TICKER_COL, sort=False).indices.items():
+            if ticker in index.parts:
+                topics[rows] = index.assign_topics(ticker, emb[rows])
+        return batch.assign(topic=topics)
+    return assign
+
+# ==========================
+# 단계 / 파이프라인
+# ==========================
+def n_rows(item):
+    return len(item[0]) if isinstance(item, tuple) else len(item)
+
+class Stage:
+    """in_q 에서 배치를 꺼내 fn 적용 → out_q (None 은 종료 신호)"""
+
+    def __init__(self, name, fn, in_q, out_q, workers: int = 1, threaded: bool = True):
+        self.name = name
+        self.fn = fn
+        self.in_q = in_q
+        self.out_q = out_q
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix=name) if threaded else None
+        self.rows_in = 0
+        self.rows_out = 0
+        self.batches = 0
+        self.busy = 0.0
+        self.depth_max = 0
+        self.depth_sum = 0
+        self.depth_samples = 0
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.in_q.get()
+            if item is None:
+                await self.in_q.put(None)   # 같은 단계의 다른 워커도 종료
+                return
+            start = time.perf_counter()
+            if self.executor is None:
+                out = self.fn(item)
+            else:
+                out = await loop.run_in_executor(self.executor, self.fn, item)
+            self.busy += time.perf_counter() - start
+            self.batches += 1
+            self.rows_in += n_rows(item)
+            if out is not None and n_rows(out):
+                self.rows_out += n_rows(out)
+                if self.out_q is not None:
+                    await self.out_q.put(out)
+
+    async def run(self):
+        try:
+            await asyncio.gather(*(self._worker() for _ in range(self.workers)))
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+        if self.out_q is not None:
+            await self.out_q.put(None)
+
+    def sample_depth(self):
+        depth = self.in_q.qsize()
+        self.depth_max = max(self.depth_max, depth)
+        self.depth_sum += depth
+        self.depth_samples += 1
+
+class Pipeline:
+    def __init__(self, args):
+        self.args = args
+        self.rows_read = 0
+        self.rows_dropped = 0     # 컬럼 수가 헤더와 다른 레코드
+        self.latencies = deque(maxlen=100_000)   # 최근 게시글 지연(초)만 유지
+        self.stages = []
+        self.started = None
+        self.out_file = None
+        self.write_header = False
+
+    # ---------- 원본 읽기 ----------
+    def _read_records(self, f, limit):
+        """
+        완전한 CSV 레코드만 최대 limit 개 (쓰는 중인 마지막 레코드는 다음에 다시 읽음)
+        따옴표가 닫히지 않은 줄은 다음 줄과 합쳐 한 레코드로 (제목 안 줄바꿈)
+        """
+        records = []
+        while len(records) < limit:
+            pos = f.tell()
+            record = f.readline()
+            while record and record.count(b'"') % 2 == 1:
+                more = f.readline()
+                if not more:
+                    break
+                record += more
+            if not record:
+                break
+            complete = record.endswith(b"\n") and record.count(b'"') % 2 == 0
+            if not complete and self.args.follow:
+                f.seek(pos)
+                break
+            records.append(record.decode("utf-8"))
+        return records
+
+    async def source(self, out_q):
+        f = await asyncio.to_thread(open, self.args.input, "rb")
+        try:
+            header = next(csv.reader([f.readline().decode("utf-8-sig")]))
+            while True:
+                records = await asyncio.to_thread(self._read_records, f, self.args.batch_size)
+                if not records:
+                    if not self.args.follow:
+                        break
+                    await asyncio.sleep(POLL_INTERVAL)
+                    continue
+                parsed = [next(csv.reader([r]), []) for r in records]
+                rows = [r for r in parsed if len(r) == len(header)]
+                self.rows_read += len(rows)
+                self.rows_dropped += len(parsed) - len(rows)
+                if not rows:
+                    continue
+                batch = pd.DataFrame(rows, columns=header)
+                batch["_t"] = time.perf_counter()
+                await out_q.put(batch)
+        finally:
+            f.close()
+        await out_q.put(None)
+
+    # ---------- 결과 쓰기 ----------
+    def write(self, batch):
+        now = time.perf_counter()
+        self.latencies.extend(now - batch["_t"].to_numpy())
+        batch = batch.drop(columns="_t")
+        if self.out_file is None:
+            os.makedirs(os.path.dirname(self.args.output), exist_ok=True)
+            new = not os.path.exists(self.args.output) or os.path.getsize(self.args.output) == 0
+            self.out_file = open(self.args.output, "a", encoding="utf-8-sig" if new else "utf-8",
+                                 newline="")
+            self.write_header = new
+        batch.to_csv(self.out_file, header=self.write_header, index=False)
+        self.write_header = False
+        self.out_file.flush()
+        return batch
+
+    # ---------- 구성 ----------
+    def build(self):
+        print("모델 로드 중...")
+        tokenizer, model, device = load_scorer()
+        steps = [
+            ("clean", clean, True),
+            ("dedup", Dedup(), False),          # 가벼운 dict 조회 → 이벤트 루프에서 바로
+            ("tokenize", make_tokenize(tokenizer), True),
+            ("score", make_score(model, device), True),
+        ]
+        if os.path.exists(os.path.join(INDEX_DIR, "meta.json")):
+            from sentence_transformers import SentenceTransformer
+            steps += [
+                ("embed", make_embed(SentenceTransformer(EMBED_MODEL)), True),
+                ("topic", make_assign_topics(IVFIndex.load(INDEX_DIR)), True),
+            ]
+        else:
+            print(f"⚠ 임베딩 색인 없음({INDEX_DIR}) → 임베딩/토픽 단계 생략 (먼저 15 실행)")
+        steps.append(("write", self.write, True))
+
+        queues = [asyncio.Queue(maxsize=self.args.queue_size) for _ in steps]
+        for i, (name, fn, threaded) in enumerate(steps):
+            out_q = queues[i + 1] if i + 1 < len(queues) else None
+            workers = self.args.score_workers if name == "score" else 1
+            self.stages.append(Stage(name, fn, queues[i], out_q, workers, threaded))
+        return queues[0]
+
+    # ---------- 보고 ----------
+    async def reporter(self):
+        last = {s.name: 0 for s in self.stages}
+        last_t = time.perf_counter()
+        next_report = last_t + REPORT_EVERY
+        while True:
+            await asyncio.sleep(0.2)
+            for s in self.stages:
+                s.sample_depth()
+            now = time.perf_counter()
+            if now < next_report:
+                continue
+            parts = []
+            for s in self.stages:
+                rate = (s.rows_in - last[s.name]) / (now - last_t)
+                last[s.name] = s.rows_in
+                parts.append(f"{s.name} {rate:,.0f}/s q{s.in_q.qsize()}")
+            rss = memory_stats.rss_mb()
+            print(f"[{now - self.started:6.1f}s] 읽음 {self.rows_read:,} (버림 {self.rows_dropped:,}) | "
+                  + " | ".join(parts)
+                  + (f" | RSS {rss:.0f}MB" if rss else ""))
+            last_t, next_report = now, now + REPORT_EVERY
+
+    def summary(self) -> pd.DataFrame:
+        elapsed = time.perf_counter() - self.started
+        # read: rows_in = 읽은 레코드, rows_out = 헤더와 컬럼 수가 맞아 흘려보낸 레코드
+        rows = [{
+            "stage": "read",
+            "rows_in": self.rows_read + self.rows_dropped,
+            "rows_out": self.rows_read,
+            "rows_per_s": round(self.rows_read / elapsed, 1) if elapsed else None,
+        }]
+        for s in self.stages:
+            rows.append({
+                "stage": s.name,
+                "workers": s.workers,
+                "rows_in": s.rows_in,
+                "rows_out": s.rows_out,
+                "batches": s.batches,
+                "busy_s": round(s.busy, 2),
+                "rows_per_busy_s": round(s.rows_in / s.busy, 1) if s.busy else None,
+                "rows_per_s": round(s.rows_in / elapsed, 1) if elapsed else None,
+                "queue_mean": round(s.depth_sum / s.depth_samples, 2) if s.depth_samples else 0,
+                "queue_max": s.depth_max,
+            })
+        return pd.DataFrame(rows, columns=list(rows[-1]))
+
+    def print_summary(self):
+        if self.started is None:
+            return
+        table = self.summary()
+        print(f"\n📌 단계별 처리량 / 큐 깊이 (큐 크기 {self.args.queue_size} 배치)")
+        print(table.to_string(index=False))
+        if self.rows_dropped:
+            print(f"\n⚠ 컬럼 수가 헤더와 다른 레코드 {self.rows_dropped:,}개를 버림")
+        if self.latencies:
+            lat = np.asarray(self.latencies) * 1000
+            print(f"\n게시글 지연(읽기 → 저장): p50 {np.percentile(lat, 50):.0f}ms, "
+                  f"p95 {np.percentile(lat, 95):.0f}ms, max {lat.max():.0f}ms")
+        os.makedirs(os.path.dirname(STATS_PATH), exist_ok=True)
+        table.to_csv(STATS_PATH, index=False, encoding="utf-8-sig")
+        print("✔ 저장 →", self.args.output, "/", STATS_PATH)
+
+    async def run(self):
+        first_q = self.build()
+        self.started = time.perf_counter()
+        report = asyncio.create_task(self.reporter())
+        try:
+            await asyncio.gather(self.source(first_q), *(s.run() for s in self.stages))
+        finally:
+            report.cancel()
+            if self.out_file is not None:
+                self.out_file.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="원본 게시글 → 감성/토픽 스트리밍 파이프라인")
+    parser.add_argument("--input", default=INPUT_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH, help="결과를 이어 붙일 CSV")
+    parser.add_argument("--follow", action="store_true", help="파일 끝에 붙는 새 글을 계속 처리")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--score-workers", type=int, default=1, help="감성 모델 스레드 수")
+    args = parser.parse_args()
+
+    pipeline = Pipeline(args)
+    try:
+        asyncio.run(pipeline.run())
+    except KeyboardInterrupt:
+        print("\n⛔ 중단")
+    finally:
+        pipeline.print_summary()
+
+if __name__ == "__main__":
+    main()
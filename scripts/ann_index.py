@@ -0,0 +1,256 @@
+"""
+제목 임베딩 근사 최근접 이웃(ANN) 색인 — IVF(inverted file) 방식, 종목별 파티션
+
+- 종목마다 k-means 중심(nlist개)으로 벡터를 나눠 담고, 질의 시 가까운 nprobe개 리스트만 탐색
+- 코사인 유사도 기준 (벡터는 L2 정규화 후 float16으로 보관)
+- add()로 증분 삽입: 새 벡터는 대기 구역에 붙여 두고(검색에도 바로 포함),
+  대기 구역이 본체의 COMPACT_RATIO 배를 넘을 때만 리스트 순으로 합쳐 정렬 → 삽입 비용 분할 상환 O(1)
+- 중심 학습은 리스트당 최대 TRAIN_PER_LIST 개 표본만 사용 (대형 종목도 학습 시간 일정)
+- save()/load()로 디스크 저장
+- 각 벡터에 행 번호(ids)와 토픽 번호(topics)를 함께 저장 → 새 제목의 토픽 배정에 사용
+
+사용 예)
+    from ann_index import IVFIndex
+    index = IVFIndex.load("../results/embedding_index")
+    ids, scores = index.search("삼성전자", query_vectors, k=10)
+    topics = index.assign_topics("삼성전자", query_vectors, k=15)
+"""
+import os
+import json
+import numpy as np
+
+NO_TOPIC = -2
+TRAIN_PER_LIST = 256      # k-means 학습 표본: 리스트당 최대 개수
+COMPACT_RATIO = 0.25      # 대기 구역이 본체의 이 비율을 넘으면 합침
+COMPACT_MIN = 1024
+
+def normalize(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    norm = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norm, 1e-12)
+
+def kmeans(x: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 42,
+           max_per_cluster: int = TRAIN_PER_LIST) -> np.ndarray:
+    """구면 k-means (코사인) — 중심 행렬 반환, 클러스터당 max_per_cluster 개 표본으로 학습"""
+    rng = np.random.default_rng(seed)
+    n_clusters = max(1, min(n_clusters, len(x)))
+    if max_per_cluster and len(x) > max_per_cluster * n_clusters:
+        x = x[np.sort(rng.choice(len(x), max_per_cluster * n_clusters, replace=False))]
+    centroids = x[rng.choice(len(x), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = np.argmax(x @ centroids.T, axis=1)
+        # 클러스터 순으로 정렬 후 구간 합 (np.add.at 보다 빠름)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_clusters)
+        starts = np.cumsum(counts) - counts
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(x[order], starts[~empty], axis=0)
+        # 빈 클러스터는 임의 점으로 다시 시작
+        sums[empty] = x[rng.choice(len(x), int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+# =======================================
+# 종목 하나의 IVF 파티션
+# =======================================
+class _Partition:
+    def __init__(self, centroids, vectors, ids, topics, lists):
+        self.centroids = centroids      # (nlist, dim) float32
+        self.vectors = vectors          # (n, dim) float16, 리스트 순으로 정렬
+        self.ids = ids                  # (n,) int64
+        self.topics = topics            # (n,) int32
+        self.lists = lists              # (nlist + 1,) 리스트 경계
+        self.pending = []               # 아직 합치지 않은 (리스트 번호, 벡터, ids, topics) 묶음
+        self._pending_sorted = None
+
+    @classmethod
+    def train(cls, vectors, ids, topics, nlist):
+        x = normalize(vectors)
+        nlist = nlist or max(1, int(np.sqrt(len(x))))
+        centroids = kmeans(x, nlist)
+        part = cls(centroids, np.empty((0, x.shape[1]), np.float16),
+                   np.empty(0, np.int64), np.empty(0, np.int32), np.zeros(len(centroids) + 1, np.int64))
+        part.add(x, ids, topics)
+        part.compact()
+        return part
+
+    @property
+    def n_pending(self) -> int:
+        return sum(len(chunk[0]) for chunk in self.pending)
+
+    def add(self, vectors, ids, topics):
+        """대기 구역에 붙이기만 함 (삽입 크기에 비례), 대기 구역이 커지면 그때 합침"""
+        x = normalize(vectors)
+        assign = np.argmax(x @ self.centroids.T, axis=1)
+        self.pending.append((assign, x.astype(np.float16), np.asarray(ids, np.int64),
+                             np.asarray(topics, np.int32)))
+        self._pending_sorted = None
+        if self.n_pending > max(COMPACT_MIN, COMPACT_RATIO * len(self.ids)):
+            self.compact()
+
+    def _sorted_pending(self):
+        """대기 구역을 리스트 순으로 정렬 → (vectors, ids, topics, lists), 다음 add 전까지 캐시"""
+        if self._pending_sorted is None:
+            assign, vectors, ids, topics = (np.concatenate(c) for c in zip(*self.pending))
+            order = np.argsort(assign, kind="stable")
+            counts = np.bincount(assign, minlength=len(self.centroids))
+            self._pending_sorted = (vectors[order], ids[order], topics[order],
+                                    np.r_[0, np.cumsum(counts)].astype(np.int64))
+        return self._pending_sorted
+
+    def compact(self):
+        """본체 + 대기 구역을 리스트 순으로 합침 (stable → 리스트 안 삽입 순서 유지)"""
+        if not self.pending:
+            return
+        p_vectors, p_ids, p_topics, p_lists = self._sorted_pending()
+        # 리스트 l 안에서는 본체 항목 뒤에 대기 구역 항목이 오도록 최종 위치 계산
+        lists = self.lists + p_lists
+        dest_old = np.arange(len(self.ids)) + np.repeat(p_lists[:-1], np.diff(self.lists))
+        dest_new = np.arange(len(p_ids)) + np.repeat(self.lists[1:], np.diff(p_lists))
+
+        n = len(self.ids) + len(p_ids)
+        vectors = np.empty((n, self.centroids.shape[1]), np.float16)
+        ids = np.empty(n, np.int64)
+        topics = np.empty(n, np.int32)
+        vectors[dest_old], ids[dest_old], topics[dest_old] = self.vectors, self.ids, self.topics
+        vectors[dest_new], ids[dest_new], topics[dest_new] = p_vectors, p_ids, p_topics
+
+        self.vectors, self.ids, self.topics, self.lists = vectors, ids, topics, lists
+        self.pending = []
+        self._pending_sorted = None
+
+    def _segments(self):
+        """(벡터, 리스트 경계, 전체 번호 시작) — 본체 다음에 대기 구역 번호가 이어짐"""
+        segs = [(self.vectors, self.lists, 0)]
+        if self.pending:
+            p_vectors, _, _, p_lists = self._sorted_pending()
+            segs.append((p_vectors, p_lists, len(self.ids)))
+        return segs
+
+    def _lookup(self, idx, main, pending_pos):
+        """search 가 돌려준 번호 → ids / topics 값 (대기 구역 포함, -1 자리는 그대로)"""
+        safe = np.maximum(idx, 0)
+        if not self.pending:
+            return main[safe]
+        extra = self._sorted_pending()[pending_pos]
+        n = len(main)
+        return np.where(safe < n, main[np.minimum(safe, n - 1)],
+                        extra[np.clip(safe - n, 0, len(extra) - 1)])
+
+    def ids_of(self, idx):
+        return self._lookup(idx, self.ids, 1)
+
+    def topics_of(self, idx):
+        return self._lookup(idx, self.topics, 2)
+
+    def search(self, q, k, nprobe):
+        nprobe = min(nprobe, len(self.centroids))
+        probe = np.argsort(-(q @ self.centroids.T), axis=1)[:, :nprobe]
+
+        out_idx = np.full((len(q), k), -1, dtype=np.int64)
+        out_score = np.full((len(q), k), -np.inf, dtype=np.float32)
+        # 리스트 단위로 돌면서 그 리스트를 탐색하는 질의들을 행렬곱 한 번에 처리
+        segs = self._segments()
+        for l in np.unique(probe):
+            qi = None
+            for vectors, lists, base in segs:
+                start, end = lists[l], lists[l + 1]
+                if start == end:
+                    continue
+                if qi is None:
+                    qi = np.flatnonzero((probe == l).any(axis=1))
+                self._merge_topk(out_idx, out_score, qi, q[qi] @ vectors[start:end].astype(np.float32).T,
+                                 np.arange(base + start, base + end), k)
+        return out_idx, out_score
+
+    @staticmethod
+    def _merge_topk(out_idx, out_score, qi, scores, cand, k):
+        # 지금까지의 top-k와 합쳐 다시 top-k
+        all_scores = np.concatenate([out_score[qi], scores], axis=1)
+        all_idx = np.concatenate([out_idx[qi], np.broadcast_to(cand, scores.shape)], axis=1)
+        top = np.argpartition(-all_scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(all_scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        out_score[qi] = np.take_along_axis(top_scores, order, axis=1)
+        out_idx[qi] = np.take_along_axis(np.take_along_axis(all_idx, top, axis=1), order, axis=1)
+
+# =======================================
+# 종목별 파티션 묶음
+# =======================================
+class IVFIndex:
+    def __init__(self, nlist: int = None, nprobe: int = 8):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.parts = {}
+
+    def add(self, ticker: str, vectors, ids, topics=None):
+        """종목 파티션에 벡터 추가 (처음이면 k-means 학습 후 생성)"""
+        if topics is None:
+            topics = np.full(len(ids), NO_TOPIC, dtype=np.int32)
+        if ticker in self.parts:
+            self.parts[ticker].add(vectors, ids, topics)
+        else:
+            self.parts[ticker] = _Partition.train(vectors, ids, topics, self.nlist)
+
+    def search(self, ticker: str, queries, k: int = 10, nprobe: int = None):
+        """배치 k-NN → (행 번호, 코사인 유사도), 모자란 자리는 -1 / -inf"""
+        part = self.parts[ticker]
+        idx, scores = part.search(normalize(queries), k, nprobe or self.nprobe)
+        ids = np.where(idx >= 0, part.ids_of(idx), -1)
+        return ids, scores
+
+    def assign_topics(self, ticker: str, queries, k: int = 15, nprobe: int = None) -> np.ndarray:
+        """이웃 k개의 토픽 다수결(유사도 가중)로 새 제목의 토픽 배정, 아웃라이어(-1)는 제외"""
+        part = self.parts[ticker]
+        idx, scores = part.search(normalize(queries), k, nprobe or self.nprobe)
+        topics = np.where(idx >= 0, part.topics_of(idx), NO_TOPIC)
+        valid = (idx >= 0) & (topics >= 0)
+        if not valid.any():
+            return np.full(len(idx), -1, dtype=np.int32)
+
+        n_topics = int(topics[valid].max()) + 1
+        votes = np.zeros((len(idx), n_topics), dtype=np.float32)
+        rows = np.repeat(np.arange(len(idx)), idx.shape[1]).reshape(idx.shape)
+        np.add.at(votes, (rows[valid], topics[valid]), np.maximum(scores[valid], 0))
+        return np.where(votes.max(axis=1) > 0, votes.argmax(axis=1), -1).astype(np.int32)
+
+    # ---------- 저장 / 로드 ----------
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        tickers = sorted(self.parts)
+        for i, ticker in enumerate(tickers):
+            p = self.parts[ticker]
+            p.compact()
+            np.savez(os.path.join(path, f"part_{i}.npz"), centroids=p.centroids, vectors=p.vectors,
+                     ids=p.ids, topics=p.topics, lists=p.lists)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"nlist": self.nlist, "nprobe": self.nprobe, "tickers": tickers},
+                      f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["nlist"], meta["nprobe"])
+        for i, ticker in enumerate(meta["tickers"]):
+            with np.load(os.path.join(path, f"part_{i}.npz")) as z:
+                index.parts[ticker] = _Partition(z["centroids"], z["vectors"], z["ids"],
+                                                 z["topics"], z["lists"])
+        return index
+
+# =======================================
+# 정확 검색(brute force) — recall 기준선
+# =======================================
+def brute_force_search(vectors, queries, k: int = 10) -> np.ndarray:
+    x = normalize(vectors)
+    q = normalize(queries)
+    scores = q @ x.T
+    kk = min(k, len(x))
+    top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+def recall_at_k(approx_ids: np.ndarray, exact_ids: np.ndarray) -> float:
+    hits = [len(set(a[a >= 0]) & set(e)) for a, e in zip(approx_ids, exact_ids)]
+    return float(np.sum(hits) / exact_ids.size)
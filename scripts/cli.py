@@ -0,0 +1,175 @@
+"""
+파이프라인 통합 실행기 (단계별 하위 명령)
+
+    python cli.py --help
+    python cli.py score                     # 03 감성 스코어링
+    python cli.py heatmap                   # 11 토픽-감성 히트맵
+    python cli.py shard run --workers 4     # 17 분산 스코어링 (뒤 인자는 그대로 전달)
+    python cli.py relabel --lexicon ./v2.json   # 경로 옵션은 실행한 위치 기준 (PATH_OPTIONS)
+    python cli.py summary                   # 기존 결과 요약 (표준 라이브러리만 사용)
+    python cli.py importtime [단계 ...]      # 단계별 import 시간 보고
+
+이 파일은 표준 라이브러리만 import 한다.
+torch / transformers / bertopic / sentence_transformers / matplotlib 등은
+해당 단계 스크립트를 실행할 때 그 스크립트 안에서만 로드된다.
+"""
+import os
+import re
+import sys
+import ast
+import csv
+import time
+import runpy
+import argparse
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 하위 명령 → (스크립트, 설명)
+STAGES = {
+    "check": ("01_check_csv.py", "원본 CSV 컬럼/결측 점검"),
+    "label": ("02_make_binary_dataset.py", "키워드 약지도 라벨링 + balanced 데이터셋"),
+    "score": ("03_finetune_koelectra_binary.py", "KoELECTRA 감성 스코어링"),
+    "eda": ("04_apply_model.py", "감성 분포 EDA"),
+    "topics": ("05_topic_modeling.py", "종목별 BERTopic 토픽 모델링"),
+    "aggregate": ("06_stock_sentiment_by_ticker.py", "종목별 감성 집계 (+신뢰구간)"),
+    "viz": ("07_visualize_results.py", "결과 시각화"),
+    "viz-clean": ("08_visualize_results_clean.py", "핵심 결과 시각화"),
+    "heatmap": ("11_topic_sentiment_heatmap.py", "토픽-감성 히트맵"),
+    "distill": ("12_distill_student.py", "student 모델 지식 증류"),
+    "index": ("13_build_title_index.py", "제목 역색인 생성"),
+    "results-db": ("14_build_results_db.py", "결과 CSV → SQLite 통합"),
+    "ann": ("15_build_embedding_index.py", "임베딩 ANN 색인 생성"),
+    "bench-topics": ("16_benchmark_topic_backends.py", "토픽 백엔드 벤치마크"),
+    "shard": ("17_sharded_scoring.py", "샤드 기반 분산 스코어링"),
+    "relabel": ("18_relabel_incremental.py", "사전 변경분만 증분 라벨링"),
+    "stream": ("19_stream_pipeline.py", "정제→스코어링→토픽 스트리밍 파이프라인"),
+}
+
+# 단계 스크립트에 넘길 때 실행 위치 기준 절대 경로로 바꾸는 옵션 (스크립트는 scripts/ 에서 실행되므로)
+PATH_OPTIONS = {"--input", "--output", "--lexicon", "--work-dir"}
+
+SUMMARY_PATH = os.path.join(BASE_DIR, "..", "results", "sentiment_by_ticker.csv")
+
+# ==========================
+# 단계 실행
+# ==========================
+def absolutize_paths(args, cwd):
+    """PATH_OPTIONS 값(--opt 값 / --opt=값)의 상대 경로 → cwd 기준 절대 경로"""
+    out = list(args)
+    for i, arg in enumerate(out):
+        opt, eq, value = arg.partition("=")
+        if eq and opt in PATH_OPTIONS:
+            out[i] = f"{opt}={os.path.abspath(os.path.join(cwd, value))}"
+        elif i > 0 and out[i - 1] in PATH_OPTIONS and not arg.startswith("-"):
+            out[i] = os.path.abspath(os.path.join(cwd, arg))
+    return out
+
+def run_stage(name, extra_args):
+    script, _ = STAGES[name]
+    path = os.path.join(BASE_DIR, script)
+    # 각 스크립트는 scripts/ 기준 상대 경로(../data 등)를 사용
+    # → 사용자가 넘긴 경로는 chdir 전에 원래 위치 기준으로 고정
+    extra_args = absolutize_paths(extra_args, os.getcwd())
+    os.chdir(BASE_DIR)
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    sys.argv = [path] + list(extra_args)
+    runpy.run_path(path, run_name="__main__")
+
+# ==========================
+# 결과 요약 (가벼운 명령)
+# ==========================
+def summary(topn):
+    if not os.path.exists(SUMMARY_PATH):
+        print("⛔ 집계 결과가 없습니다 → 먼저 `python cli.py aggregate`")
+        return
+    with open(SUMMARY_PATH, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    total = sum(int(r["전체댓글수"]) for r in rows)
+    pos = sum(int(r["긍정수"]) for r in rows)
+    rows.sort(key=lambda r: float(r["감성스코어"]), reverse=True)
+
+    print(f"종목 {len(rows)}개, 게시글 {total:,}건, 전체 긍정비율 {pos / max(total, 1) * 100:.2f}%")
+    print(f"\n📌 감성스코어 TOP {topn}")
+    for r in rows[:topn]:
+        print(f"  {r['종목명']:<12} {float(r['감성스코어']):7.2f}  (n={r['전체댓글수']})")
+    print(f"\n📌 감성스코어 BOTTOM {topn}")
+    for r in rows[::-1][:topn]:
+        print(f"  {r['종목명']:<12} {float(r['감성스코어']):7.2f}  (n={r['전체댓글수']})")
+
+# ==========================
+# import 시간 보고
+# ==========================
+def top_level_imports(script_path):
+    """스크립트 최상위 import 문만 뽑아 소스로 반환 (실제 실행 없이 import 비용만 측정)"""
+    with open(script_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    nodes = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(n) for n in nodes)
+
+def measure_imports(code):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=BASE_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+
+    # "import time: self [us] | cumulative | name" 중 최상위 패키지만
+    heavy = []
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S.*)$", line)
+        if m:
+            heavy.append((int(m.group(1)) / 1e6, m.group(2)))
+    heavy.sort(reverse=True)
+    error = proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 else ""
+    return elapsed, heavy[:3], error
+
+def import_report(names):
+    names = names or list(STAGES)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(BASE_DIR, "cli.py"), "--help"],
+                   capture_output=True)
+    print(f"cli.py --help: {time.perf_counter() - start:.2f}s (인터프리터 시작 포함)\n")
+
+    print(f"{'단계':<13} {'import(s)':>9}  가장 무거운 패키지")
+    for name in names:
+        code = top_level_imports(os.path.join(BASE_DIR, STAGES[name][0]))
+        elapsed, heavy, error = measure_imports(code)
+        detail = ", ".join(f"{mod} {sec:.2f}s" for sec, mod in heavy)
+        if error:
+            detail = f"⚠ {error}"
+        print(f"{name:<13} {elapsed:9.2f}  {detail}")
+
+# ==========================
+# 메인
+# ==========================
+def main():
+    parser = argparse.ArgumentParser(description="KoELECTRA 감성 + BERTopic 파이프라인 실행기")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, (script, help_text) in STAGES.items():
+        sub.add_parser(name, help=f"{help_text} ({script})")
+
+    p = sub.add_parser("summary", help="sentiment_by_ticker.csv 요약 (빠름)")
+    p.add_argument("--top", type=int, default=10)
+
+    p = sub.add_parser("importtime", help="단계별 최상위 import 시간 보고")
+    p.add_argument("stages", nargs="*", metavar="단계", help="생략하면 전체 단계")
+
+    # 단계 명령은 뒤 인자를 해석하지 않고 스크립트에 그대로 전달
+    if len(sys.argv) > 1 and sys.argv[1] in STAGES:
+        run_stage(sys.argv[1], sys.argv[2:])
+        return
+
+    args = parser.parse_args()
+    if args.command == "summary":
+        summary(args.top)
+    else:
+        unknown = [s for s in args.stages if s not in STAGES]
+        if unknown:
+            parser.error(f"알 수 없는 단계: {', '.join(unknown)}")
+        import_report(args.stages)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+감성 키워드 사전(버전 파일) + 벡터화 라벨링 + 문자 bigram → 행 색인
+
+- 사전: ../data/lexicon/v{N}.json  (POS_STRONG / NEG_STRONG / POS_WEAK / NEG_WEAK)
+        번호가 가장 큰 파일이 현재 사전, 단어를 바꿀 때는 새 버전 파일을 추가
+- 라벨: 행마다 범주별 "포함된 단어 수"(N x 4)만 있으면 규칙을 벡터로 적용 가능
+        → 사전이 바뀌면 추가/삭제된 단어가 들어 있는 행의 카운트만 ±1
+- 색인: 공백을 뺀 제목의 문자 bigram → 행 번호 (부분 문자열 포함 여부를 후보 행만 보고 판정)
+
+사용 예)
+    from lexicon import load_lexicon, latest_lexicon_path, count_hits, label_from_counts
+    lex = load_lexicon(latest_lexicon_path())
+    labels = label_from_counts(count_hits(normalize_texts(df["제목_전처리"]), lex))
+"""
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+
+LEXICON_DIR = "../data/lexicon"
+CATEGORIES = ("POS_STRONG", "NEG_STRONG", "POS_WEAK", "NEG_WEAK")
+
+# =======================================
+# 사전 파일
+# =======================================
+def lexicon_version(path: str) -> int:
+    m = re.search(r"v(\d+)\.json$", os.path.basename(path))
+    return int(m.group(1)) if m else -1
+
+def latest_lexicon_path(lexicon_dir: str = LEXICON_DIR) -> str:
+    files = [f for f in os.listdir(lexicon_dir) if lexicon_version(f) >= 0]
+    if not files:
+        raise FileNotFoundError(f"❌ 사전 파일(v*.json)이 없음: {lexicon_dir}")
+    return os.path.join(lexicon_dir, max(files, key=lexicon_version))
+
+def load_lexicon(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    missing = [c for c in CATEGORIES if c not in raw]
+    if missing:
+        raise KeyError(f"❌ 사전에 범주가 없음: {missing} ({path})")
+    # 중복 제거 (같은 단어가 두 번 있어도 한 번만 센다)
+    return {c: sorted(set(raw[c])) for c in CATEGORIES}
+
+def diff_lexicon(old: dict, new: dict) -> list:
+    """[(범주 번호, 단어, +1 추가 / -1 삭제), ...]"""
+    changes = []
+    for ci, c in enumerate(CATEGORIES):
+        before, after = set(old.get(c, [])), set(new[c])
+        changes += [(ci, w, 1) for w in sorted(after - before)]
+        changes += [(ci, w, -1) for w in sorted(before - after)]
+    return changes
+
+# =======================================
+# 라벨링 (-1 부정 / 1 긍정)
+# =======================================
+def normalize_texts(texts: pd.Series) -> pd.Series:
+    # 문자열이 아니면 빈 문자열 → 아무 단어도 안 맞아 부정(-1)
+    return texts.where(texts.map(lambda x: isinstance(x, str)), "").str.replace(" ", "", regex=False)
+
+def count_hits(texts: pd.Series, lexicon: dict) -> np.ndarray:
+    """행별/범주별 포함된 단어 수 (N x 4, int16) — 전체 스캔"""
+    counts = np.zeros((len(texts), len(CATEGORIES)), dtype=np.int16)
+    for ci, c in enumerate(CATEGORIES):
+        for w in lexicon[c]:
+            counts[:, ci] += texts.str.contains(w, regex=False).to_numpy()
+    return counts
+
+def label_from_counts(counts: np.ndarray) -> np.ndarray:
+    """
+    02의 규칙 그대로:
+      강한 단어만 긍정 → 1 / 강한 단어에 부정이 하나라도 있으면 → -1
+      강한 단어가 없으면 약한 긍정 → 1, 그 외(약한 부정, 무관) → -1
+    """
+    pos_s, neg_s, pos_w = counts[:, 0] > 0, counts[:, 1] > 0, counts[:, 2] > 0
+    positive = (pos_s & ~neg_s) | (~pos_s & ~neg_s & pos_w)
+    return np.where(positive, 1, -1).astype(np.int8)
+
+# =======================================
+# 문자 bigram → 행 색인
+# =======================================
+def _bigram_codes(cp: np.ndarray) -> np.ndarray:
+    # 유니코드 코드포인트 < 2^21 → 두 글자를 하나의 int64로
+    return (cp[:-1].astype(np.int64) << 21) | cp[1:].astype(np.int64)
+
+def _as_codepoints(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+class BigramIndex:
+    """keys(정렬된 bigram 코드) / offsets / rows(각 bigram을 포함한 행 번호, 오름차순)"""
+
+    FILES = ("keys", "offsets", "rows")
+
+    def __init__(self, keys, offsets, rows):
+        self.keys, self.offsets, self.rows = keys, offsets, rows
+
+    @classmethod
+    def build(cls, texts: pd.Series):
+        # 행 구분자 \x00 으로 이어 붙여 한 번에 코드포인트 배열로 변환
+        texts = texts.str.replace("\x00", "", regex=False)
+        cp = _as_codepoints("\x00".join(texts))
+        if len(cp) < 2:
+            return cls(np.empty(0, np.int64), np.zeros(1, np.int64), np.empty(0, np.int32))
+
+        lengths = texts.str.len().to_numpy()
+        row_of = np.repeat(np.arange(len(texts), dtype=np.int32), lengths + 1)[:len(cp) - 1]
+        codes = _bigram_codes(cp)
+        valid = (cp[:-1] != 0) & (cp[1:] != 0)
+        codes, row_of = codes[valid], row_of[valid]
+
+        # 위치가 행 순서이므로 안정 정렬하면 같은 bigram 안에서 행 번호가 오름차순
+        order = np.argsort(codes, kind="stable")
+        codes, row_of = codes[order], row_of[order]
+        keep = np.r_[True, (codes[1:] != codes[:-1]) | (row_of[1:] != row_of[:-1])]
+        codes, row_of = codes[keep], row_of[keep]
+
+        starts = np.r_[True, codes[1:] != codes[:-1]]
+        keys = codes[starts]
+        offsets = np.r_[np.flatnonzero(starts), len(codes)].astype(np.int64)
+        return cls(keys, offsets, row_of)
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        for name in self.FILES:
+            # 임시 파일 → os.replace (저장 중에 죽어도 이전 색인이 깨지지 않게)
+            dest = os.path.join(path, f"bigram_{name}.npy")
+            tmp = f"{dest}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, getattr(self, name))
+            os.replace(tmp, dest)
+
+    @classmethod
+    def load(cls, path: str):
+        return cls(*(np.load(os.path.join(path, f"bigram_{name}.npy"), mmap_mode="r")
+                     for name in cls.FILES))
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return all(os.path.exists(os.path.join(path, f"bigram_{n}.npy")) for n in cls.FILES)
+
+    def _postings(self, code: int) -> np.ndarray:
+        i = np.searchsorted(self.keys, code)
+        if i == len(self.keys) or self.keys[i] != code:
+            return np.empty(0, dtype=np.int32)
+        return np.asarray(self.rows[self.offsets[i]:self.offsets[i + 1]])
+
+    def candidates(self, term: str):
+        """term의 모든 bigram을 포함한 행 (1글자 단어는 None → 전체 스캔 필요)"""
+        if len(term) < 2:
+            return None
+        lists = sorted((self._postings(c) for c in np.unique(_bigram_codes(_as_codepoints(term)))),
+                       key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def rows_containing(self, term: str, texts) -> np.ndarray:
+        """texts(공백 제거된 제목 리스트) 중 term을 부분 문자열로 포함한 행 번호"""
+        cand = self.candidates(term)
+        if cand is None:
+            cand = range(len(texts))
+        return np.array([r for r in cand if term in texts[r]], dtype=np.int64)
+
+# =======================================
+# balanced 데이터셋 (02 / 18 공통)
+# =======================================
+def make_balanced(df: pd.DataFrame, text_col: str, per_class: int = 1000, seed: int = 42):
+    from sklearn.utils import shuffle
+
+    pos_df = df[df["label"] == 1]
+    neg_df = df[df["label"] == -1]
+    n = min(len(pos_df), len(neg_df), per_class)
+
+    balanced = pd.concat([
+        pos_df.sample(n=n, random_state=seed),
+        neg_df.sample(n=n, random_state=seed)
+    ], axis=0)
+    balanced = shuffle(balanced, random_state=seed)
+    return balanced[[text_col, "label"]], n
@@ -0,0 +1,80 @@
+"""
+프로세스 메모리 측정 (Linux /proc 기반, 다른 OS에서는 가능한 값만)
+
+- rss_mb : 현재 상주 메모리(RSS) — 공유 페이지도 프로세스마다 전부 더해짐
+- pss_mb : 비례 배분 메모리(PSS) — 공유 페이지를 공유 프로세스 수로 나눠 더함
+           (워커 여러 개의 PSS 합 ≈ 실제 사용 RAM)
+- shared_mb : 다른 프로세스와 공유 중인 페이지
+"""
+import os
+import sys
+
+def _read_kb(path, keys):
+    out = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in keys:
+                    out[name] = int(rest.split()[0])
+    except OSError:
+        pass
+    return out
+
+def rss_mb(pid="self"):
+    kb = _read_kb(f"/proc/{pid}/status", {"VmRSS"})
+    if "VmRSS" in kb:
+        return kb["VmRSS"] / 1024
+    if pid == "self" and sys.platform != "win32":
+        # /proc가 없으면 최대 RSS로 대신 (macOS는 bytes, Linux는 KB)
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return None
+
+def pss_mb(pid="self"):
+    kb = _read_kb(f"/proc/{pid}/smaps_rollup", {"Pss"})
+    return kb["Pss"] / 1024 if "Pss" in kb else None
+
+def shared_mb(pid="self"):
+    kb = _read_kb(f"/proc/{pid}/smaps_rollup", {"Shared_Clean", "Shared_Dirty"})
+    return sum(kb.values()) / 1024 if kb else None
+
+def snapshot(pid="self") -> dict:
+    return {
+        "pid": os.getpid() if pid == "self" else pid,
+        "rss_mb": rss_mb(pid),
+        "pss_mb": pss_mb(pid),
+        "shared_mb": shared_mb(pid),
+    }
+
+# =======================================
+# 최대 RSS (구간별) / 메모리 상한
+# =======================================
+def reset_peak():
+    """VmHWM(최대 RSS)을 현재 값으로 초기화 (Linux 4.0+), 성공 여부 반환"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb():
+    kb = _read_kb("/proc/self/status", {"VmHWM"})
+    if "VmHWM" in kb:
+        return kb["VmHWM"] / 1024
+    return rss_mb()
+
+def enforce_ceiling(limit_mb, where=""):
+    """RSS가 limit_mb를 넘으면 gc 후 다시 확인하고, 그래도 넘으면 MemoryError"""
+    if not limit_mb:
+        return
+    current = rss_mb()
+    if current is None or current <= limit_mb:
+        return
+    import gc
+    gc.collect()
+    current = rss_mb()
+    if current > limit_mb:
+        raise MemoryError(f"❌ 메모리 상한 초과: RSS {current:.0f}MB > {limit_mb}MB ({where})")
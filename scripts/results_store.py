@@ -0,0 +1,132 @@
+"""
+분석 결과 통합 저장소 (SQLite 한 파일)
+
+results/topic_modeling/*_topics.csv, *_docs.csv, results/topic_sentiment_heatmap/*_table.csv,
+results/sentiment_by_ticker.csv 를 테이블 4개로 모아 저장한다.
+
+    topic_info       ← {ticker}_topics.csv               (+ ticker 컬럼)
+    doc_topics       ← {ticker}_docs.csv                 (+ ticker 컬럼)
+    topic_sentiment  ← {ticker}_topic_sentiment_table.csv (ticker 컬럼 포함)
+    ticker_summary   ← sentiment_by_ticker.csv           (종목명 컬럼 포함)
+
+읽기 함수는 CSV를 읽었을 때와 같은 DataFrame을 돌려준다.
+(종목 하나를 지정하면 해당 종목 CSV와 동일, 지정하지 않으면 전 종목 + ticker 컬럼)
+"""
+import os
+import sqlite3
+from contextlib import closing
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "..", "results", "results.sqlite")
+
+# 테이블별 종목 컬럼 / 보조 인덱스 컬럼
+TABLES = {
+    "topic_info": ("ticker", "Topic"),
+    "doc_topics": ("ticker", "Topic"),
+    "topic_sentiment": ("ticker", "topic"),
+    "ticker_summary": ("종목명", None),
+}
+# CSV에서는 bool로 읽히지만 SQLite에는 0/1로 저장되는 컬럼
+BOOL_COLUMNS = {"Representative_document"}
+
+def connect(db_path: str = DB_PATH):
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    return closing(sqlite3.connect(db_path))
+
+def _to_sql_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # BERTopic 결과의 list 컬럼은 CSV 저장 때와 같은 문자열 형태로 변환
+    out = df.copy()
+    for col in out.columns:
+        if out[col].dtype == object:
+            out[col] = out[col].map(lambda v: str(v) if isinstance(v, (list, tuple)) else v)
+    return out
+
+def _ensure_indexes(conn, table: str):
+    ticker_col, topic_col = TABLES[table]
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_ticker" ON "{table}" ("{ticker_col}")')
+    if topic_col:
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_ticker_topic" '
+                     f'ON "{table}" ("{ticker_col}", "{topic_col}")')
+
+def _table_exists(conn, table: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+    return row is not None
+
+# =======================================
+# 쓰기
+# =======================================
+def write_table(table: str, df: pd.DataFrame, ticker: str = None, db_path: str = DB_PATH):
+    """
+    ticker 지정: 해당 종목 행만 교체(재실행해도 중복 없음)
+    ticker 미지정: 테이블 전체 교체
+    """
+    ticker_col, _ = TABLES[table]
+    df = _to_sql_frame(df)
+    if ticker is not None and ticker_col not in df.columns:
+        df.insert(0, ticker_col, ticker)
+
+    with connect(db_path) as conn:
+        if ticker is None:
+            df.to_sql(table, conn, if_exists="replace", index=False)
+        else:
+            if _table_exists(conn, table):
+                conn.execute(f'DELETE FROM "{table}" WHERE "{ticker_col}" = ?', (ticker,))
+            df.to_sql(table, conn, if_exists="append", index=False)
+        _ensure_indexes(conn, table)
+        conn.commit()
+
+def save_topic_model(ticker: str, topic_info: pd.DataFrame, documents: pd.DataFrame,
+                     db_path: str = DB_PATH):
+    write_table("topic_info", topic_info, ticker=ticker, db_path=db_path)
+    write_table("doc_topics", documents, ticker=ticker, db_path=db_path)
+
+# =======================================
+# 읽기
+# =======================================
+def read_table(table: str, ticker: str = None, topic=None, db_path: str = DB_PATH) -> pd.DataFrame:
+    ticker_col, topic_col = TABLES[table]
+    where, params = [], []
+    if ticker is not None:
+        where.append(f'"{ticker_col}" = ?')
+        params.append(ticker)
+    if topic is not None and topic_col:
+        where.append(f'"{topic_col}" = ?')
+        params.append(int(topic))
+
+    sql = f'SELECT * FROM "{table}"'
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY rowid"
+
+    with connect(db_path) as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+
+    for col in BOOL_COLUMNS & set(df.columns):
+        df[col] = df[col].astype(bool)
+    return df
+
+def _per_ticker(table: str, ticker: str, topic, db_path: str) -> pd.DataFrame:
+    df = read_table(table, ticker=ticker, topic=topic, db_path=db_path)
+    # 종목 하나만 읽으면 원래 CSV처럼 ticker 컬럼 없이 반환
+    if ticker is not None:
+        df = df.drop(columns=[TABLES[table][0]])
+    return df
+
+def read_topic_info(ticker: str = None, topic=None, db_path: str = DB_PATH) -> pd.DataFrame:
+    return _per_ticker("topic_info", ticker, topic, db_path)
+
+def read_doc_topics(ticker: str = None, topic=None, db_path: str = DB_PATH) -> pd.DataFrame:
+    return _per_ticker("doc_topics", ticker, topic, db_path)
+
+def read_topic_sentiment(ticker: str = None, topic=None, db_path: str = DB_PATH) -> pd.DataFrame:
+    return read_table("topic_sentiment", ticker=ticker, topic=topic, db_path=db_path)
+
+def read_ticker_summary(ticker: str = None, db_path: str = DB_PATH) -> pd.DataFrame:
+    return read_table("ticker_summary", ticker=ticker, db_path=db_path)
+
+def list_tickers(table: str = "doc_topics", db_path: str = DB_PATH) -> list:
+    ticker_col, _ = TABLES[table]
+    with connect(db_path) as conn:
+        rows = conn.execute(f'SELECT DISTINCT "{ticker_col}" FROM "{table}"').fetchall()
+    return [r[0] for r in rows]
@@ -0,0 +1,123 @@
+"""
+그룹별 감성 지표 신뢰구간 (벡터화 부트스트랩 / 베이지안)
+
+모든 그룹을 정수 코드로 바꾼 뒤 NumPy 연산 한 번에 리샘플링한다. (그룹별 Python 루프 없음)
+- 감성이 이진(-1/1, 0/1)이면: n개 복원추출의 긍정 수 = Binomial(n, p) 이므로
+  그룹 × 반복 행렬을 rng.binomial 한 번으로 생성 (원 데이터 부트스트랩과 같은 분포)
+- 그 외 값이면: 그룹 내 위치를 난수로 뽑아 gather → np.add.reduceat 으로 그룹 합
+- 베이지안(기본값): Jeffreys 구간 — Beta(긍정 + 0.5, 부정 + 0.5) 분위수를 scipy beta.ppf 로 정확히 계산
+  (표본 추출 없음 → seed / n_boot 과 무관), 긍정 수가 0이면 하한 0, n이면 상한 1
+  → 전부 긍정/부정인 그룹의 구간도 관측값(0% / 100%)을 포함
+
+이진 감성의 기본값이 부트스트랩이 아니라 베이지안인 이유:
+백분위 부트스트랩은 긍정 수가 0 또는 n이면 모든 리샘플이 같아 폭 0 구간이 된다
+(n=1, 긍정 1건 → [100%, 100%]). 표본이 작은 그룹일수록 흔한 경우라 "bootstrap"을 지정해도
+이런 그룹은 Jeffreys 구간으로 대신한다.
+
+이진 감성이면 평균 감성(-1~1) 구간은 긍정 비율 구간을 2p - 1로 변환한 것과 같다.
+"""
+import numpy as np
+import pandas as pd
+from scipy.stats import beta
+
+N_BOOT = 2000
+ALPHA = 0.05
+SEED = 42
+CHUNK = 20_000_000    # 일반값 부트스트랩 한 번에 다루는 원소 수 상한 (메모리 제한)
+
+def _quantiles(samples: np.ndarray, alpha: float):
+    lo, hi = np.quantile(samples, [alpha / 2, 1 - alpha / 2], axis=1)
+    return lo, hi
+
+def binary_bootstrap_ci(n, pos, n_boot: int = N_BOOT, alpha: float = ALPHA, seed: int = SEED):
+    """
+    그룹별 (문서 수 n, 긍정 수 pos) → 긍정 비율 부트스트랩 구간 (lo, hi)
+    긍정 수가 0 또는 n인 그룹은 폭 0 구간이 되므로 Jeffreys 구간으로 대체
+    """
+    n = np.asarray(n, dtype=np.int64)
+    pos = np.asarray(pos, dtype=np.int64)
+    p = pos / np.maximum(n, 1)
+    rng = np.random.default_rng(seed)
+    draws = rng.binomial(n[:, None], p[:, None], size=(len(n), n_boot))
+    lo, hi = _quantiles(draws / np.maximum(n, 1)[:, None], alpha)
+
+    degenerate = (pos == 0) | (pos == n)
+    if degenerate.any():
+        b_lo, b_hi = beta_interval(n[degenerate], pos[degenerate], alpha)
+        lo[degenerate], hi[degenerate] = b_lo, b_hi
+    return lo, hi
+
+def beta_interval(n, pos, alpha: float = ALPHA):
+    """Jeffreys 구간 (lo, hi): Beta(pos + 0.5, neg + 0.5) 등꼬리 분위수, pos == 0 → lo = 0 / pos == n → hi = 1"""
+    n = np.asarray(n, dtype=np.float64)
+    pos = np.asarray(pos, dtype=np.float64)
+    a, b = pos + 0.5, n - pos + 0.5
+    lo = np.where(pos == 0, 0.0, beta.ppf(alpha / 2, a, b))
+    hi = np.where(pos == n, 1.0, beta.ppf(1 - alpha / 2, a, b))
+    # 빈 그룹(n=0)은 구간 없음
+    empty = n == 0
+    lo[empty], hi[empty] = np.nan, np.nan
+    return lo, hi
+
+def grouped_bootstrap_mean(values, codes, n_boot: int = N_BOOT, alpha: float = ALPHA, seed: int = SEED):
+    """
+    임의 값의 그룹 평균 부트스트랩 구간
+    values: (N,) 값, codes: (N,) 0..G-1 그룹 코드 → (lo, hi) 각 (G,)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.int64)
+    order = np.argsort(codes, kind="stable")
+    v = values[order]
+    counts = np.bincount(codes)
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+
+    rng = np.random.default_rng(seed)
+    means = np.empty((len(counts), n_boot))
+    group_of = np.repeat(np.arange(len(counts)), counts)
+    step = max(1, CHUNK // max(len(v), 1))
+    nonempty = counts > 0
+    for b0 in range(0, n_boot, step):
+        b1 = min(n_boot, b0 + step)
+        # (반복, N) — 각 원소 자리마다 같은 그룹 안에서 복원추출
+        offs = (rng.random((b1 - b0, len(v))) * counts[group_of]).astype(np.int64)
+        sample = v[starts[group_of] + offs]
+        sums = np.add.reduceat(sample, starts[nonempty], axis=1)
+        means[nonempty, b0:b1] = (sums / counts[nonempty]).T
+    means[~nonempty] = np.nan
+    return _quantiles(means, alpha)
+
+def group_sentiment_ci(sent, codes, n_boot: int = N_BOOT, alpha: float = ALPHA,
+                       seed: int = SEED, method: str = "bayes") -> pd.DataFrame:
+    """
+    문서 단위 감성 + 그룹 코드(0..G-1) → 그룹별 긍정비율 / 평균감성 구간
+    method: "bayes"(이진 감성일 때만, 아니면 부트스트랩) | "bootstrap"
+    columns: n, pos, pos_ratio_ci_low, pos_ratio_ci_high, mean_sent_ci_low, mean_sent_ci_high
+    """
+    s = np.asarray(sent, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.int64)
+    positive = (s == 1).astype(np.int64)
+    uniq = set(np.unique(s).tolist())
+    binary = uniq <= {-1.0, 1.0} or uniq <= {0.0, 1.0}
+
+    n = np.bincount(codes)
+    pos = np.bincount(codes, weights=positive).astype(np.int64)
+
+    if binary:
+        if method == "bayes":
+            lo, hi = beta_interval(n, pos, alpha)
+        else:
+            lo, hi = binary_bootstrap_ci(n, pos, n_boot, alpha, seed)
+        mean_lo, mean_hi = 2 * lo - 1, 2 * hi - 1
+    else:
+        # 중립(0) 등 3값 이상이면 평균감성은 값 자체로 부트스트랩 (같은 seed → 같은 리샘플)
+        lo, hi = grouped_bootstrap_mean(positive, codes, n_boot, alpha, seed)
+        mean_lo, mean_hi = grouped_bootstrap_mean(s, codes, n_boot, alpha, seed)
+
+    return pd.DataFrame({
+        "n": n,
+        "pos": pos,
+        "pos_ratio_ci_low": lo,
+        "pos_ratio_ci_high": hi,
+        "mean_sent_ci_low": mean_lo,
+        "mean_sent_ci_high": mean_hi,
+    })
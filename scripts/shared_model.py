@@ -0,0 +1,142 @@
+"""
+모델 가중치 공유 워커 풀 (fork-after-load)
+
+부모 프로세스에서 모델을 한 번만 로드한 뒤
+  1) torch 파라미터/버퍼를 공유 메모리로 옮기고(share_memory), 읽기 전용(requires_grad=False)으로 고정
+  2) fork로 워커를 띄워 모든 워커가 같은 가중치 페이지를 매핑
+→ 워커 수가 늘어도 가중치 메모리는 한 벌만 사용
+
+사용 예)
+    with SharedModelPool(load_fn, work_fn, n_workers=4) as pool:
+        results = pool.map(chunks)      # work_fn(model, chunk) 결과를 chunks 순서대로
+        pool.print_report()             # 워커별 RSS / PSS / 공유 메모리
+
+fork를 쓸 수 없는 환경(Windows) 또는 모델이 GPU에 있으면 워커 없이 현재 프로세스에서 순차 실행한다.
+"""
+import os
+import multiprocessing as mp
+
+import memory_stats
+
+# fork로 상속되는 워커 전역 상태
+_MODEL = None
+_WORK_FN = None
+
+def freeze_shared(model):
+    """nn.Module 계열이면 가중치를 공유 메모리 + 읽기 전용으로"""
+    import torch
+    # load_fn 이 (tokenizer, model) 처럼 묶음을 돌려줘도 모듈만 골라냄
+    candidates = model if isinstance(model, (tuple, list)) else [model]
+    modules = [m for m in candidates if isinstance(m, torch.nn.Module)]
+    for module in modules:
+        module.eval()
+        for p in module.parameters():
+            p.requires_grad_(False)
+        module.share_memory()
+    return modules
+
+def _on_gpu(modules):
+    return any(p.is_cuda for m in modules for p in m.parameters())
+
+def _worker_init(n_threads):
+    import torch
+    torch.set_num_threads(n_threads)
+    torch.set_grad_enabled(False)
+
+def _run_task(task):
+    i, chunk = task
+    result = _WORK_FN(_MODEL, chunk)
+    return i, result, memory_stats.snapshot()
+
+class SharedModelPool:
+    def __init__(self, load_fn, work_fn, n_workers: int = 2):
+        global _MODEL, _WORK_FN
+        # tokenizers 라이브러리의 fork 후 병렬 처리 경고/교착 방지
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+        self.parent_before = memory_stats.snapshot()
+        _MODEL = load_fn()
+        _WORK_FN = work_fn
+        modules = freeze_shared(_MODEL)
+        self.parent_after = memory_stats.snapshot()
+
+        self.n_workers = n_workers
+        self.stats = {}
+        self.pool = None
+
+        can_fork = "fork" in mp.get_all_start_methods()
+        if n_workers > 1 and can_fork and not _on_gpu(modules):
+            n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+            self.pool = mp.get_context("fork").Pool(n_workers, initializer=_worker_init,
+                                                     initargs=(n_threads,))
+        elif n_workers > 1:
+            print("⚠ fork 불가(Windows) 또는 GPU 모델 → 워커 없이 순차 실행")
+
+    def map(self, chunks):
+        tasks = list(enumerate(chunks))
+        if self.pool is None:
+            outputs = [_run_task(t) for t in tasks]
+        else:
+            outputs = self.pool.map(_run_task, tasks, chunksize=1)
+
+        results = [None] * len(tasks)
+        for i, result, snap in outputs:
+            results[i] = result
+            prev = self.stats.get(snap["pid"])
+            if prev is not None:
+                # 워커별 최대값 유지
+                snap = {k: max(v, prev[k]) if v is not None and prev[k] is not None else v
+                        for k, v in snap.items()}
+            self.stats[snap["pid"]] = snap
+        return results
+
+    def report(self) -> list:
+        rows = [{"process": "parent(로드 전)", **self.parent_before},
+                {"process": "parent(로드 후)", **self.parent_after}]
+        for n, (pid, snap) in enumerate(sorted(self.stats.items())):
+            rows.append({"process": f"worker-{n}", **snap})
+        return rows
+
+    def print_report(self):
+        print(f"\n{'process':<16} {'pid':>7} {'RSS(MB)':>9} {'PSS(MB)':>9} {'shared(MB)':>11}")
+        fmt = lambda v: f"{v:.1f}" if v is not None else "-"
+        total_pss = 0.0
+        for r in self.report():
+            print(f"{r['process']:<16} {r['pid']:>7} {fmt(r['rss_mb']):>9} {fmt(r['pss_mb']):>9} "
+                  f"{fmt(r['shared_mb']):>11}")
+            if r["process"].startswith("worker") and r["pss_mb"] is not None:
+                total_pss += r["pss_mb"]
+        if total_pss:
+            print(f"워커 PSS 합계: {total_pss:.1f}MB (공유 가중치는 한 번만 계산됨)")
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def split_chunks(items, n_chunks):
+    size = max(1, -(-len(items) // max(n_chunks, 1)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _encode_chunk(model, docs):
+    return model.encode(docs, show_progress_bar=False)
+
+def embedding_encoder(load_fn, n_workers: int = 1):
+    """
+    SentenceTransformer 인코딩 함수 → (encode(docs), pool)
+    n_workers > 1 이면 가중치를 공유하는 워커 풀에서 나눠 인코딩 (끝나면 pool.close())
+    """
+    if n_workers <= 1:
+        model = load_fn()
+        return (lambda docs: model.encode(docs, show_progress_bar=False)), None
+
+    import numpy as np
+    pool = SharedModelPool(load_fn, _encode_chunk, n_workers)
+    return (lambda docs: np.concatenate(pool.map(split_chunks(docs, n_workers)))), pool
@@ -0,0 +1,266 @@
+"""
+게시글 제목(제목_전처리) 역색인 + 질의 API
+
+- 포스팅 리스트: 행 번호를 delta + varint(LEB128)로 압축해 하나의 바이트 blob에 저장
+- 행 단위 필터 컬럼: 종목 코드 / 감성(-1, 1) / 토픽 번호(토픽 결과가 없으면 -2)
+  · 토픽 번호는 종목별 BERTopic 모델마다 따로 매겨지므로 토픽 필터는 종목 하나와 함께만,
+    facet 도 (종목, 토픽) 단위로 센다
+- 저장 형식: 폴더 안의 .npy 파일들 → np.load(mmap_mode="r")로 즉시 로드
+
+사용 예)
+    from title_index import TitleIndex
+    idx = TitleIndex.load("../results/title_index")
+    rows = idx.search(all_terms=["공매도*"], ticker="삼성전자", sentiment=-1, topic=3)
+    idx.titles(rows[:20]), idx.facets(rows)
+"""
+import os
+import json
+import bisect
+import numpy as np
+import pandas as pd
+
+TEXT_COL = "제목_전처리"
+TICKER_COL = "종목명"
+NO_TOPIC = -2
+
+# =======================================
+# varint 압축 (numpy 벡터화)
+# =======================================
+def varint_nbytes(values: np.ndarray) -> np.ndarray:
+    v = np.asarray(values, dtype=np.uint64)
+    nbytes = np.ones(len(v), dtype=np.int64)
+    for k in range(1, 10):
+        nbytes += v >= (np.uint64(1) << np.uint64(7 * k))
+    return nbytes
+
+def varint_encode(values: np.ndarray) -> np.ndarray:
+    v = np.asarray(values, dtype=np.uint64)
+    nbytes = varint_nbytes(v)
+
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    starts = np.cumsum(nbytes) - nbytes
+    for k in range(int(nbytes.max()) if len(v) else 0):
+        mask = nbytes > k
+        byte = (v[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        byte |= np.where(nbytes[mask] > k + 1, 0x80, 0).astype(np.uint64)
+        out[starts[mask] + k] = byte.astype(np.uint8)
+    return out
+
+def varint_decode(buf: np.ndarray) -> np.ndarray:
+    buf = np.asarray(buf, dtype=np.uint8)
+    if len(buf) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    ends = np.flatnonzero(buf < 0x80)
+    starts = np.r_[0, ends[:-1] + 1]
+    group = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shift = (np.arange(len(buf)) - starts[group]) * 7
+
+    parts = (buf & 0x7F).astype(np.float64) * np.exp2(shift)
+    return np.bincount(group, weights=parts, minlength=len(ends)).astype(np.int64)
+
+def tokenize(titles: pd.Series) -> pd.Series:
+    # 전처리된 제목은 공백 기준 토큰 (index = 행 번호)
+    return titles.fillna("").astype(str).str.lower().str.split().explode().dropna()
+
+# =======================================
+# 토픽 결과(05의 *_docs.csv) 행 단위 결합
+# =======================================
+def load_row_topics(df: pd.DataFrame, topic_dir: str) -> np.ndarray:
+    topics = np.full(len(df), NO_TOPIC, dtype=np.int32)
+    if not topic_dir or not os.path.isdir(topic_dir):
+        return topics
+
+    # 05는 df[df["종목명"] == ticker] 순서 그대로 문서를 저장하므로 위치로 결합
+    for ticker, rows in df.groupby(TICKER_COL, sort=False).indices.items():
+        path = os.path.join(topic_dir, f"{ticker}_docs.csv")
+        if not os.path.exists(path):
+            continue
+        docs = pd.read_csv(path, encoding="utf-8", usecols=["Document", "Topic"])
+        if len(docs) != len(rows):
+            print(f"  ⚠ {ticker}: 토픽 문서 수 불일치({len(docs)} != {len(rows)}) → 토픽 제외")
+            continue
+        topics[rows] = docs["Topic"].astype(np.int32).values
+    return topics
+
+# =======================================
+# 역색인
+# =======================================
+class TitleIndex:
+    def __init__(self, arrays: dict, tickers: list):
+        self.a = arrays
+        self.tickers = tickers
+        self.ticker_code = {t: i for i, t in enumerate(tickers)}
+        self.vocab = arrays["vocab"]
+        self._vocab_list = None
+
+    # ---------- 생성 / 저장 / 로드 ----------
+    @classmethod
+    def build(cls, df: pd.DataFrame, sentiment: pd.Series, topic_dir: str = None):
+        n = len(df)
+        df = df.reset_index(drop=True)
+        ticker_codes, tickers = pd.factorize(df[TICKER_COL].astype(str))
+
+        tokens = tokenize(df[TEXT_COL])
+        term_ids, vocab = pd.factorize(tokens, sort=True)
+        rows = tokens.index.values.astype(np.int64)
+
+        # (term, row) 중복 제거 + term → row 순 정렬
+        keys = np.unique(term_ids.astype(np.int64) * n + rows)
+        term_of = keys // n
+        row_of = keys % n
+
+        first = np.r_[True, term_of[1:] != term_of[:-1]]
+        deltas = np.where(first, row_of, np.diff(row_of, prepend=0))
+        doc_freq = np.bincount(term_of, minlength=len(vocab)).astype(np.int64)
+
+        blob = varint_encode(deltas)
+        value_ends = np.cumsum(varint_nbytes(deltas))
+        term_last = np.cumsum(doc_freq) - 1
+        offsets = np.r_[0, value_ends[term_last]].astype(np.int64)
+
+        titles = df[TEXT_COL].fillna("").astype(str)
+        title_bytes = [t.encode("utf-8") for t in titles]
+        title_offsets = np.r_[0, np.cumsum([len(b) for b in title_bytes])].astype(np.int64)
+
+        arrays = {
+            "vocab": np.asarray(vocab, dtype=str),
+            "offsets": offsets,
+            "doc_freq": doc_freq,
+            "postings": blob,
+            "ticker": ticker_codes.astype(np.int32),
+            "sentiment": pd.to_numeric(sentiment, errors="coerce").fillna(0).astype(np.int8).values,
+            "topic": load_row_topics(df, topic_dir),
+            "title_offsets": title_offsets,
+            "titles": np.frombuffer(b"".join(title_bytes), dtype=np.uint8),
+        }
+        return cls(arrays, list(tickers))
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        for name, arr in self.a.items():
+            np.save(os.path.join(path, f"{name}.npy"), arr)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"tickers": self.tickers, "rows": int(len(self.a["ticker"]))},
+                      f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {}
+        for fname in os.listdir(path):
+            if fname.endswith(".npy"):
+                arrays[fname[:-4]] = np.load(os.path.join(path, fname), mmap_mode="r")
+        return cls(arrays, meta["tickers"])
+
+    # ---------- 포스팅 ----------
+    def _term_range(self, term: str):
+        if self._vocab_list is None:
+            self._vocab_list = self.vocab.tolist()
+        term = term.lower()
+        if term.endswith("*"):
+            prefix = term[:-1]
+            lo = bisect.bisect_left(self._vocab_list, prefix)
+            hi = bisect.bisect_left(self._vocab_list, prefix + "\U0010ffff")
+            return lo, hi
+        lo = bisect.bisect_left(self._vocab_list, term)
+        if lo < len(self._vocab_list) and self._vocab_list[lo] == term:
+            return lo, lo + 1
+        return lo, lo
+
+    def postings(self, term: str) -> np.ndarray:
+        """단어(또는 '접두어*')가 들어간 행 번호 (정렬됨)"""
+        lo, hi = self._term_range(term)
+        if lo == hi:
+            return np.empty(0, dtype=np.int64)
+
+        offsets = self.a["offsets"]
+        doc_freq = self.a["doc_freq"]
+        deltas = varint_decode(self.a["postings"][offsets[lo]:offsets[hi]])
+
+        # 각 단어 첫 값은 절대 위치, 이후는 delta → 단어별 누적합
+        lens = np.asarray(doc_freq[lo:hi])
+        term_start = np.r_[0, np.cumsum(lens)[:-1]]
+        total = np.cumsum(deltas)
+        base = np.repeat(total[term_start] - deltas[term_start], lens)
+        rows = total - base
+        return np.unique(rows) if hi - lo > 1 else rows
+
+    # ---------- 질의 ----------
+    def filter_mask(self, rows=None, ticker=None, sentiment=None, topic=None):
+        col = (lambda name: self.a[name]) if rows is None else (lambda name: self.a[name][rows])
+        n = len(self.a["ticker"]) if rows is None else len(rows)
+        mask = np.ones(n, dtype=bool)
+        if ticker is not None:
+            codes = [self.ticker_code.get(t, -1) for t in np.atleast_1d(ticker)]
+            mask &= np.isin(col("ticker"), codes)
+        if sentiment is not None:
+            mask &= np.isin(col("sentiment"), np.atleast_1d(sentiment))
+        if topic is not None:
+            # 토픽 번호는 종목 안에서만 의미가 있음
+            if ticker is None or len(np.atleast_1d(ticker)) != 1:
+                raise ValueError("❌ topic 필터는 ticker 하나와 함께 지정해야 함 (토픽 번호는 종목별)")
+            mask &= np.isin(col("topic"), np.atleast_1d(topic))
+        return mask
+
+    def search(self, all_terms=(), any_terms=(), not_terms=(),
+               ticker=None, sentiment=None, topic=None) -> np.ndarray:
+        """
+        불리언 단어 질의 + 종목/감성/토픽 필터 → 행 번호
+        - all_terms: 모두 포함(AND), any_terms: 하나 이상(OR), not_terms: 제외(NOT)
+        - 단어 끝에 '*'를 붙이면 접두어 질의 (예: '공매도*' → 공매도가, 공매도는 ...)
+        - topic 은 종목별 번호이므로 ticker 하나와 함께만 사용
+        """
+        rows = None
+        # AND는 짧은 포스팅부터 교집합
+        for p in sorted((self.postings(t) for t in all_terms), key=len):
+            rows = p if rows is None else np.intersect1d(rows, p, assume_unique=True)
+        if any_terms:
+            union = np.unique(np.concatenate([self.postings(t) for t in any_terms]))
+            rows = union if rows is None else np.intersect1d(rows, union, assume_unique=True)
+
+        if rows is None:
+            rows = np.flatnonzero(self.filter_mask(ticker=ticker, sentiment=sentiment, topic=topic))
+        else:
+            rows = rows[self.filter_mask(rows, ticker=ticker, sentiment=sentiment, topic=topic)]
+
+        for t in not_terms:
+            rows = np.setdiff1d(rows, self.postings(t), assume_unique=True)
+        return rows
+
+    def facets(self, rows) -> dict:
+        """검색 결과의 종목 / 감성 / (종목, 토픽)별 건수"""
+        rows = np.asarray(rows, dtype=np.int64)
+        codes = np.asarray(self.a["ticker"][rows])
+        ticker_counts = np.bincount(codes, minlength=len(self.tickers))
+        by_ticker = pd.Series(ticker_counts, index=self.tickers)
+        # (종목, 토픽) 쌍을 정수 하나로 묶어 bincount → 0이 아닌 칸만 MultiIndex 로
+        topics = np.asarray(self.a["topic"][rows]).astype(np.int64)
+        width = int(topics.max()) - NO_TOPIC + 1 if len(topics) else 1
+        pair_counts = np.bincount(codes.astype(np.int64) * width + (topics - NO_TOPIC))
+        nz = np.flatnonzero(pair_counts)
+        by_topic = pd.Series(pair_counts[nz], index=pd.MultiIndex.from_arrays(
+            [np.asarray(self.tickers, dtype=object)[nz // width], nz % width + NO_TOPIC],
+            names=[TICKER_COL, "topic"]))
+        by_topic = by_topic.sort_values(ascending=False, kind="stable")
+        return {
+            "ticker": by_ticker[by_ticker > 0].sort_values(ascending=False),
+            "sentiment": pd.Series(self.a["sentiment"][rows]).value_counts(),
+            "topic": by_topic,
+        }
+
+    def titles(self, rows) -> list:
+        off = self.a["title_offsets"]
+        buf = self.a["titles"]
+        return [bytes(buf[off[r]:off[r + 1]]).decode("utf-8") for r in rows]
+
+    def frame(self, rows) -> pd.DataFrame:
+        rows = np.asarray(rows, dtype=np.int64)
+        return pd.DataFrame({
+            "row": rows,
+            TICKER_COL: [self.tickers[c] for c in self.a["ticker"][rows]],
+            TEXT_COL: self.titles(rows),
+            "sentiment": np.asarray(self.a["sentiment"][rows]),
+            "topic": np.asarray(self.a["topic"][rows]),
+        })
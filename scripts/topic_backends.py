@@ -0,0 +1,91 @@
+"""
+BERTopic 차원축소/군집 백엔드 선택
+
+    "umap_hdbscan" : BERTopic 기본값(UMAP + HDBSCAN) — 문서 수가 적을 때 품질 우선
+    "ipca_kmeans"  : IncrementalPCA + MiniBatchKMeans — 배치 단위로 학습, 대형 종목용
+    "rp_kmeans"    : GaussianRandomProjection + MiniBatchKMeans — 가장 빠름
+    "auto"         : 종목 문서 수가 AUTO_THRESHOLD 이하면 umap_hdbscan, 넘으면 ipca_kmeans
+
+k-means 계열은 아웃라이어(-1) 토픽이 생기지 않는다.
+"""
+import numpy as np
+from bertopic import BERTopic
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.random_projection import GaussianRandomProjection
+
+BACKENDS = ("umap_hdbscan", "ipca_kmeans", "rp_kmeans")
+AUTO_THRESHOLD = 5000     # 이 문서 수를 넘는 종목은 확장형 백엔드 사용
+AUTO_LARGE_BACKEND = "ipca_kmeans"
+
+PCA_DIM = 5               # UMAP 기본(n_components=5)과 맞춤
+RP_DIM = 32               # 랜덤 투영은 거리 보존을 위해 조금 더 큰 차원
+BATCH_SIZE = 2048
+SEED = 42
+
+def resolve_backend(backend: str, n_docs: int) -> str:
+    if backend == "auto":
+        return "umap_hdbscan" if n_docs <= AUTO_THRESHOLD else AUTO_LARGE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"❌ 알 수 없는 토픽 백엔드: {backend} (선택: auto, {', '.join(BACKENDS)})")
+    return backend
+
+def n_clusters_for(n_docs: int) -> int:
+    # HDBSCAN이 보통 만들어내는 토픽 수와 비슷한 규모
+    return int(np.clip(np.sqrt(n_docs / 2), 2, 100))
+
+def make_topic_model(n_docs: int, backend: str = "auto") -> BERTopic:
+    backend = resolve_backend(backend, n_docs)
+    if backend == "umap_hdbscan":
+        return BERTopic(language="multilingual")
+
+    if backend == "ipca_kmeans":
+        reducer = IncrementalPCA(n_components=PCA_DIM, batch_size=max(BATCH_SIZE, PCA_DIM))
+    else:
+        reducer = GaussianRandomProjection(n_components=RP_DIM, random_state=SEED)
+
+    clusterer = MiniBatchKMeans(
+        n_clusters=min(n_clusters_for(n_docs), n_docs),
+        batch_size=BATCH_SIZE,
+        random_state=SEED,
+        n_init=3,
+    )
+    return BERTopic(language="multilingual", umap_model=reducer, hdbscan_model=clusterer)
+
+# =======================================
+# 토픽 일관성 (NPMI, 문서 단위 동시출현)
+# =======================================
+def topic_coherence(topic_model: BERTopic, docs, top_n: int = 10) -> float:
+    """토픽별 상위 단어쌍 NPMI 평균의 토픽 평균 (-1 ~ 1, 높을수록 일관적)"""
+    topic_words = []
+    for tid in topic_model.get_topics():
+        if tid == -1:
+            continue
+        words = [w for (w, _) in topic_model.get_topic(tid)][:top_n]
+        words = [w for w in words if w]
+        if len(words) >= 2:
+            topic_words.append(words)
+    if not topic_words:
+        return float("nan")
+
+    vocab = sorted({w for words in topic_words for w in words})
+    vec = CountVectorizer(vocabulary=vocab, binary=True, token_pattern=r"(?u)\b\w+\b")
+    x = vec.fit_transform([str(d) for d in docs]).astype(np.float64)
+    n = x.shape[0]
+
+    p = np.asarray(x.sum(axis=0)).ravel() / n
+    p_joint = (x.T @ x).toarray() / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pmi = np.log(p_joint / np.outer(p, p))
+        npmi = pmi / -np.log(p_joint)
+    npmi[p_joint == 0] = -1.0
+    npmi[p_joint >= 1] = 1.0
+
+    col = {w: i for i, w in enumerate(vocab)}
+    scores = []
+    for words in topic_words:
+        ids = np.array([col[w] for w in words])
+        sub = npmi[np.ix_(ids, ids)]
+        scores.append(sub[np.triu_indices(len(ids), k=1)].mean())
+    return float(np.mean(scores))